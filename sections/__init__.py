@@ -0,0 +1,9 @@
+# sections/__init__.py - Optional check-in sections, imported only when switched on
+
+# Card shown at the top of each optional section
+OPTIONAL_CARD_TEMPLATE = """
+<div class="optional-section">
+    <h4>{title}</h4>
+    <p>{subtitle}</p>
+</div>
+"""
@@ -0,0 +1,44 @@
+# sections/growth.py - Optional Growth & Meaning questions for the daily check-in
+
+import streamlit as st
+
+from sections import OPTIONAL_CARD_TEMPLATE
+
+GROWTH_CARD_HTML = OPTIONAL_CARD_TEMPLATE.format(
+    title="🧘‍♀️ Mindfulness & Growth",
+    subtitle="These are bonus questions for when you're feeling strong"
+)
+
+@st.fragment
+def render():
+    """Draw the optional Growth & Meaning section and share its answers"""
+    with st.expander("🌱 Optional: Growth & Meaning (when you have extra energy)", expanded=True):
+        st.markdown(GROWTH_CARD_HTML, unsafe_allow_html=True)
+
+        mindfulness_minutes = st.number_input(
+            "Mindfulness/meditation (minutes):",
+            min_value=0, max_value=120, value=0, step=1
+        )
+
+        gratitude = st.text_area(
+            "What are you grateful for today:",
+            placeholder="Small moments count: a cuppa, a kind text, sunshine...",
+            height=80
+        )
+
+        self_compassion = st.slider(
+            "How kind to yourself (1-10):",
+            min_value=1, max_value=10, value=5, step=1
+        )
+
+        hope_level = st.slider(
+            "Hope for the future:",
+            min_value=1, max_value=10, value=5, step=1
+        )
+
+    st.session_state.checkin['growth'] = {
+        'mindfulness_minutes': mindfulness_minutes,
+        'gratitude': gratitude,
+        'self_compassion': self_compassion,
+        'hope_level': hope_level
+    }
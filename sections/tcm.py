@@ -0,0 +1,131 @@
+# sections/tcm.py - Optional Traditional Chinese Medicine questions for the daily check-in
+
+import streamlit as st
+
+from sections import OPTIONAL_CARD_TEMPLATE
+
+TCM_CARD_HTML = OPTIONAL_CARD_TEMPLATE.format(
+    title="🌸 TCM Daily Assessment",
+    subtitle="Traditional Chinese Medicine looks at subtle patterns that reveal deeper health insights"
+)
+
+TONGUE_COLOURS = (
+    "Select...",
+    "Healthy pink",
+    "Pale (possible Qi/blood deficiency)",
+    "Red (heat/inflammation in body)",
+    "Purple (blood/Qi stagnation, cold)",
+    "Dark red (excess heat)"
+)
+
+TONGUE_COATINGS = (
+    "Select...",
+    "Thin white (healthy)",
+    "Thick white (dampness/cold)",
+    "Yellow coating (heat/inflammation)",
+    "No coating (Yin deficiency)",
+    "Greasy/thick (excess dampness)"
+)
+
+TONGUE_SHAPES = (
+    "Normal size/shape",
+    "Swollen/puffy (Qi deficiency)",
+    "Teeth marks on sides (Spleen weakness)",
+    "Cracks/fissures (Yin deficiency)",
+    "Thin/narrow (blood deficiency)",
+    "Pointed/tense sides (stress/Liver Qi stagnation)"
+)
+
+BODY_TEMPERATURE_OPTIONS = (
+    "Select...",
+    "Balanced/normal",
+    "Running cold (Yang deficiency)",
+    "Running hot (Yin deficiency/heat)",
+    "Cold hands/feet, warm body",
+    "Hot flashes/cold spells"
+)
+
+DAMPNESS_SIGNS = (
+    "Feeling heavy/sluggish",
+    "Bloating after meals",
+    "Sticky/sweet taste in mouth",
+    "Excessive mucus/phlegm",
+    "Foggy thinking",
+    "Swollen ankles/puffiness",
+    "Loose stools",
+    "None noticed"
+)
+
+EMOTIONAL_ELEMENTS = (
+    "Select...",
+    "Balanced/centred",
+    "Worry/overthinking (Earth/Spleen)",
+    "Anger/frustration (Wood/Liver)",
+    "Joy/overexcitement (Fire/Heart)",
+    "Sadness/grief (Metal/Lung)",
+    "Fear/anxiety (Water/Kidney)"
+)
+
+@st.fragment
+def render():
+    """Draw the optional TCM section and share its answers"""
+    with st.expander("🉐 Traditional Chinese Medicine Insights (optional but valuable)", expanded=True):
+        st.markdown(TCM_CARD_HTML, unsafe_allow_html=True)
+
+        tcm_col1, tcm_col2 = st.columns(2, gap="small")
+
+        with tcm_col1:
+            # Tongue observation (mirror of internal health)
+            tongue_colour = st.selectbox(
+                "Tongue colour this morning:",
+                TONGUE_COLOURS,
+                help="Check tongue in morning before eating/drinking - reflects internal organ health"
+            )
+
+            tongue_coating = st.selectbox(
+                "Tongue coating:",
+                TONGUE_COATINGS,
+                help="Coating reflects digestive health and internal dampness/heat"
+            )
+
+            tongue_shape = st.multiselect(
+                "Tongue characteristics:",
+                TONGUE_SHAPES,
+                help="Shape reveals constitutional patterns and organ function"
+            )
+
+        with tcm_col2:
+            # Energy and constitutional patterns
+            qi_energy = st.slider(
+                "Qi (life energy) level:",
+                min_value=1, max_value=10, value=5, step=1,
+                help="1 = Completely depleted, 10 = Vibrant life force energy"
+            )
+
+            body_temperature = st.selectbox(
+                "Body temperature tendency today:",
+                BODY_TEMPERATURE_OPTIONS,
+                help="Temperature patterns reveal Yang (warming) vs Yin (cooling) balance"
+            )
+
+            dampness_signs = st.multiselect(
+                "Signs of dampness (poor fluid metabolism):",
+                DAMPNESS_SIGNS,
+                help="Dampness = sluggish metabolism of fluids, common in modern lifestyle"
+            )
+
+            emotional_element = st.selectbox(
+                "Dominant emotion/element today:",
+                EMOTIONAL_ELEMENTS,
+                help="Five Element theory: emotions reflect organ energy imbalances"
+            )
+
+    st.session_state.checkin['tcm'] = {
+        'tongue_colour': tongue_colour,
+        'tongue_coating': tongue_coating,
+        'tongue_shape': frozenset(tongue_shape),
+        'qi_energy': qi_energy,
+        'body_temperature': body_temperature,
+        'dampness_signs': frozenset(dampness_signs),
+        'emotional_element': emotional_element
+    }
@@ -10,8 +10,10 @@ Follow each step and run the code to understand what's happening.
 
 import sqlite3
 import datetime
-import pandas as pd
+import csv
+from itertools import chain, islice
 import os
+from wellness_helpers import database_size_bytes, summarize  # shared helpers (test_database.py uses them too)
 
 print("🚀 SQLITE SETUP GUIDE FOR WELLNESS TRACKER")
 print("=" * 50)
@@ -28,9 +30,31 @@ database_name = "wellness_tracker.db"
 connection = sqlite3.connect(database_name)
 cursor = connection.cursor()
 
+# Speed-up settings (PRAGMAs) - run these straight after connecting
+# - WAL journal: fewer disk syncs per commit, readers don't block writers
+# - synchronous=NORMAL: safe with WAL (only the last commit can be lost on power cut)
+# - temp_store/cache_size/mmap_size: keep more of the database in memory
+# - auto_vacuum=INCREMENTAL: lets us reclaim space in small steps later
+#   (only takes effect if set before the first table is created)
+cursor.executescript("""
+    PRAGMA auto_vacuum=INCREMENTAL;
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+""")
+
 print(f"✅ Database file created: {database_name}")
-print(f"📍 Location: {os.path.abspath(database_name)}")
-print(f"💾 File size: {os.path.getsize(database_name)} bytes")
+# Work out the full path once and reuse it (each os.path call hits the disk)
+DB_PATH = os.path.abspath(database_name)
+
+def db_size():
+    """Current size of the database in bytes (main file plus the -wal file new writes go to)"""
+    return database_size_bytes(DB_PATH)
+
+print(f"📍 Location: {DB_PATH}")
+print(f"💾 File size: {db_size()} bytes")
 
 # ===============================
 # STEP 2: CREATE YOUR TABLES
@@ -65,8 +89,31 @@ CREATE TABLE IF NOT EXISTS wellness_entries (
 """
 
 cursor.execute(create_table_sql)
+
+# One entry per day: a UNIQUE index on date
+try:
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_date_unique
+    ON wellness_entries(date)
+    """)
+    UNIQUE_DATES = True
+except sqlite3.IntegrityError:
+    # Databases made by older versions of this script may already hold more
+    # than one entry for a day - keep them as they are and carry on without
+    # the unique index (new rows then check for their date before inserting)
+    UNIQUE_DATES = False
+    print("⚠️ Some dates already have more than one entry - skipping the one-entry-per-day rule")
+
+# Index on date so "ORDER BY date DESC" and "WHERE date = ?" don't scan the whole table
+cursor.execute("""
+CREATE INDEX IF NOT EXISTS idx_entries_date_mood
+ON wellness_entries(date DESC, mood_rating)
+""")
 connection.commit()
 
+# Gather statistics so SQLite's query planner knows to use the index
+cursor.execute("ANALYZE")
+
 print("✅ Table 'wellness_entries' created successfully!")
 
 # Show table structure
@@ -84,94 +131,105 @@ for col in columns:
 print("\n📝 STEP 3: Adding Sample Data")
 print("-" * 40)
 
-# Sample data to test your database
-sample_entries = [
-    {
-        'date': '2024-01-15',
-        'tracking_reason': '🧠 Trauma recovery & PTSD healing',
-        'mood_rating': 7,
-        'safety_level': 6,
-        'energy_level': 5,
-        'sleep_hours': 7.5,
-        'water_intake': 2.0,
-        'social_connection': 'Good interactions - felt heard',
-        'daily_win': 'Had a productive therapy session',
-        'quick_mode': False,
-        'exercise_today': 'Yes',
-        'sleep_quality': 6,
-        'stress_level': 4,
-        'triggers_encountered': 'Maybe',
-        'physical_symptoms': 'None',
-        'coping_strategies': 'Deep breathing, Journaling',
-        'notes': 'Feeling more grounded today'
-    },
-    {
-        'date': '2024-01-16',
-        'tracking_reason': '😰 Anxiety & stress management', 
-        'mood_rating': 5,
-        'safety_level': 7,
-        'energy_level': 4,
-        'sleep_hours': 6.0,
-        'water_intake': 1.5,
-        'social_connection': 'Minimal social contact',
-        'daily_win': 'Made breakfast and tidied room',
-        'quick_mode': True,
-        'notes': 'Anxious morning but better afternoon'
-    },
-    {
-        'date': '2024-01-17',
-        'tracking_reason': '🌱 General wellness & self-care',
-        'mood_rating': 8,
-        'safety_level': 8,
-        'energy_level': 7,
-        'sleep_hours': 8.0,
-        'water_intake': 2.5,
-        'social_connection': 'Deep, meaningful connections',
-        'daily_win': 'Had coffee with a good friend',
-        'quick_mode': False,
-        'exercise_today': 'Yes',
-        'sleep_quality': 8,
-        'stress_level': 3,
-        'triggers_encountered': 'No',
-        'physical_symptoms': 'None',
-        'coping_strategies': 'Time in nature, Meditation',
-        'notes': 'Great day overall, feeling positive'
-    }
-]
-
-# Insert sample data
-insert_sql = """
-INSERT INTO wellness_entries (
-    date, tracking_reason, mood_rating, safety_level, energy_level,
-    sleep_hours, water_intake, social_connection, daily_win, quick_mode,
-    exercise_today, sleep_quality, stress_level, triggers_encountered,
-    physical_symptoms, coping_strategies, notes
-) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-"""
+# Column order used by INSERT_ENTRY_SQL (one place to change if columns change)
+ENTRY_COLUMNS = (
+    'date', 'tracking_reason', 'mood_rating', 'safety_level', 'energy_level',
+    'sleep_hours', 'water_intake', 'social_connection', 'daily_win', 'quick_mode',
+    'exercise_today', 'sleep_quality', 'stress_level', 'triggers_encountered',
+    'physical_symptoms', 'coping_strategies', 'notes'
+)
+ENTRY_DEFAULTS = {'quick_mode': False}
 
-for entry in sample_entries:
-    cursor.execute(insert_sql, (
-        entry['date'],
-        entry['tracking_reason'],
-        entry['mood_rating'],
-        entry['safety_level'],
-        entry['energy_level'],
-        entry['sleep_hours'],
-        entry['water_intake'],
-        entry['social_connection'],
-        entry['daily_win'],
-        entry['quick_mode'],
-        entry.get('exercise_today'),
-        entry.get('sleep_quality'),
-        entry.get('stress_level'),
-        entry.get('triggers_encountered'),
-        entry.get('physical_symptoms'),
-        entry.get('coping_strategies'),
-        entry['notes']
-    ))
+def _entry_to_row(entry_data):
+    """Turn an entry dictionary into a tuple in ENTRY_COLUMNS order"""
+    row = {**ENTRY_DEFAULTS, **entry_data}
+    return tuple(row.get(column) for column in ENTRY_COLUMNS)
 
-connection.commit()
-print(f"✅ Added {len(sample_entries)} sample entries")
+# Sample data to test your database
+# Each row is already a tuple in ENTRY_COLUMNS order, ready to hand to SQLite:
+# (date, tracking_reason, mood_rating, safety_level, energy_level,
+#  sleep_hours, water_intake, social_connection, daily_win, quick_mode,
+#  exercise_today, sleep_quality, stress_level, triggers_encountered,
+#  physical_symptoms, coping_strategies, notes)
+SAMPLE_ROWS = (
+    (
+        '2024-01-15', '🧠 Trauma recovery & PTSD healing', 7, 6, 5,
+        7.5, 2.0, 'Good interactions - felt heard', 'Had a productive therapy session', False,
+        'Yes', 6, 4, 'Maybe',
+        'None', 'Deep breathing, Journaling', 'Feeling more grounded today'
+    ),
+    (
+        '2024-01-16', '😰 Anxiety & stress management', 5, 7, 4,
+        6.0, 1.5, 'Minimal social contact', 'Made breakfast and tidied room', True,
+        None, None, None, None,
+        None, None, 'Anxious morning but better afternoon'
+    ),
+    (
+        '2024-01-17', '🌱 General wellness & self-care', 8, 8, 7,
+        8.0, 2.5, 'Deep, meaningful connections', 'Had coffee with a good friend', False,
+        'Yes', 8, 3, 'No',
+        'None', 'Time in nature, Meditation', 'Great day overall, feeling positive'
+    ),
+)
+
+# The INSERT statement
+# (written once here and reused by add_wellness_entry() in STEP 7,
+#  so SQLite can keep the compiled statement in its cache)
+# "ON CONFLICT(date) DO NOTHING" quietly skips a row if that date already
+# has an entry, so running this script again doesn't create duplicates.
+# (Unlike "INSERT OR IGNORE", invalid values like a mood of 15 still raise an error.)
+# ON CONFLICT needs the unique date index - without it, insert_entry_rows()
+# drops rows for dates that already exist before inserting.
+INSERT_ENTRY_PREFIX = f"INSERT INTO wellness_entries ({', '.join(ENTRY_COLUMNS)}) VALUES "
+ROW_PLACEHOLDER = "(" + ", ".join(["?"] * len(ENTRY_COLUMNS)) + ")"
+SKIP_EXISTING_DATES = " ON CONFLICT(date) DO NOTHING" if UNIQUE_DATES else ""
+INSERT_ENTRY_SQL = INSERT_ENTRY_PREFIX + ROW_PLACEHOLDER + SKIP_EXISTING_DATES
+
+# Several rows per INSERT statement is faster than one row per statement.
+# 50 rows x 17 columns = 850 values, under SQLite's 999-value limit.
+ROWS_PER_STATEMENT = 50
+
+def _drop_existing_dates(connection, batch):
+    """Rows from the batch whose date has no entry yet (first row per date wins)"""
+    dates = [row[0] for row in batch]
+    existing = {date for (date,) in connection.execute(
+        f"SELECT date FROM wellness_entries WHERE date IN ({', '.join(['?'] * len(dates))})", dates
+    )}
+    new_rows = []
+    for row in batch:
+        if row[0] not in existing:
+            existing.add(row[0])
+            new_rows.append(row)
+    return new_rows
+
+def insert_entry_rows(connection, rows):
+    """Insert row tuples using multi-row VALUES, ROWS_PER_STATEMENT at a time
+
+    rows can be any iterable - even a generator. Only one batch is held in
+    memory at a time, so large imports don't need to fit in RAM.
+    """
+    rows = iter(rows)
+    added = 0
+    while True:
+        batch = list(islice(rows, ROWS_PER_STATEMENT))
+        if not batch:
+            break
+        if not UNIQUE_DATES:
+            batch = _drop_existing_dates(connection, batch)
+            if not batch:
+                continue
+        sql = INSERT_ENTRY_PREFIX + ", ".join([ROW_PLACEHOLDER] * len(batch)) + SKIP_EXISTING_DATES
+        batch_cursor = connection.execute(sql, list(chain.from_iterable(batch)))
+        added += batch_cursor.rowcount  # skipped (existing) dates aren't counted
+    return added
+
+# Insert all the rows in ONE transaction
+# (one commit for the whole batch is much faster than one per row)
+# "with connection:" commits automatically when the block finishes
+with connection:
+    added_count = insert_entry_rows(connection, SAMPLE_ROWS)
+
+print(f"✅ Added {added_count} sample entries ({len(SAMPLE_ROWS) - added_count} already there)")
 
 # ===============================
 # STEP 4: QUERY YOUR DATA
@@ -180,10 +238,10 @@ print(f"✅ Added {len(sample_entries)} sample entries")
 print("\n🔍 STEP 4: Testing Database Queries")
 print("-" * 40)
 
-# Count total entries
-cursor.execute("SELECT COUNT(*) FROM wellness_entries")
-total_count = cursor.fetchone()[0]
+# Count total entries (and grab the averages for later at the same time)
+avg_mood, avg_energy, avg_sleep, total_count, first_date, last_date = summarize(connection)
 print(f"📊 Total entries in database: {total_count}")
+print(f"📅 Date range: {first_date} to {last_date}")
 
 # Get recent entries
 print("\n📋 Recent Entries:")
@@ -198,20 +256,11 @@ recent_entries = cursor.fetchall()
 for entry in recent_entries:
     print(f"   {entry[0]} | Mood: {entry[1]}/10 | Energy: {entry[2]}/10 | Win: {entry[3]}")
 
-# Calculate averages
-cursor.execute("""
-    SELECT 
-        AVG(mood_rating) as avg_mood,
-        AVG(energy_level) as avg_energy,
-        AVG(sleep_hours) as avg_sleep
-    FROM wellness_entries
-""")
-
-averages = cursor.fetchone()
+# Show the averages calculated by summarize() above
 print(f"\n📈 Your Averages:")
-print(f"   Mood: {averages[0]:.1f}/10")
-print(f"   Energy: {averages[1]:.1f}/10") 
-print(f"   Sleep: {averages[2]:.1f} hours")
+print(f"   Mood: {avg_mood:.1f}/10")
+print(f"   Energy: {avg_energy:.1f}/10") 
+print(f"   Sleep: {avg_sleep:.1f} hours")
 
 # ===============================
 # STEP 5: PANDAS INTEGRATION
@@ -220,6 +269,9 @@ print(f"   Sleep: {averages[2]:.1f} hours")
 print("\n🐼 STEP 5: Loading Data with Pandas")
 print("-" * 40)
 
+# pandas is a big library, so we only import it here where it's first needed
+import pandas as pd
+
 # Load all data into a pandas DataFrame
 df = pd.read_sql_query("SELECT * FROM wellness_entries", connection)
 
@@ -239,8 +291,15 @@ print("\n💾 STEP 6: Creating Backup")
 print("-" * 40)
 
 # Export to CSV (backup)
+# Rows are streamed straight from the database into the file one at a time,
+# so the whole table never has to fit in memory
 backup_filename = f"wellness_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-df.to_csv(backup_filename, index=False)
+backup_cursor = connection.execute("SELECT * FROM wellness_entries")
+
+with open(backup_filename, 'w', newline='', encoding='utf-8') as backup_file:
+    writer = csv.writer(backup_file)
+    writer.writerow([column[0] for column in backup_cursor.description])
+    writer.writerows(backup_cursor)
 
 print(f"✅ Backup created: {backup_filename}")
 print(f"📁 File size: {os.path.getsize(backup_filename)} bytes")
@@ -252,51 +311,72 @@ print(f"📁 File size: {os.path.getsize(backup_filename)} bytes")
 print("\n🛠️ STEP 7: Useful Functions")
 print("-" * 40)
 
-def add_wellness_entry(connection, entry_data):
-    """Add a new wellness entry to the database"""
-    cursor = connection.cursor()
-    
-    insert_sql = """
-    INSERT INTO wellness_entries (
-        date, tracking_reason, mood_rating, safety_level, energy_level,
-        sleep_hours, water_intake, social_connection, daily_win, quick_mode,
-        exercise_today, sleep_quality, stress_level, triggers_encountered,
-        physical_symptoms, coping_strategies, notes
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+def add_wellness_entry(connection, entry_data_or_list, *, commit=True):
+    """Add one wellness entry (a dict) or a batch of entries (a list of dicts)
+
+    A batch is written with multi-row INSERTs and committed once. The batch
+    can be a generator - for big sources (files, streams) prefer one, so
+    the entries never all sit in memory together.
+    Returns the new row ID for a single entry (None if that date already
+    has an entry), or the number of rows added for a batch.
     """
+    if isinstance(entry_data_or_list, dict):
+        # connection.execute() reuses the connection's own cursor machinery,
+        # so there's no need to create a cursor object ourselves
+        row = _entry_to_row(entry_data_or_list)
+        if UNIQUE_DATES or _drop_existing_dates(connection, [row]):
+            insert_cursor = connection.execute(INSERT_ENTRY_SQL, row)
+            result = insert_cursor.lastrowid if insert_cursor.rowcount else None
+        else:
+            result = None  # that date already has an entry
+    else:
+        # A generator: rows are converted as they're inserted, not all up front
+        params = (_entry_to_row(entry) for entry in entry_data_or_list)
+        result = insert_entry_rows(connection, params)
     
-    cursor.execute(insert_sql, (
-        entry_data.get('date'),
-        entry_data.get('tracking_reason'),
-        entry_data.get('mood_rating'),
-        entry_data.get('safety_level'),
-        entry_data.get('energy_level'),
-        entry_data.get('sleep_hours'),
-        entry_data.get('water_intake'),
-        entry_data.get('social_connection'),
-        entry_data.get('daily_win'),
-        entry_data.get('quick_mode', False),
-        entry_data.get('exercise_today'),
-        entry_data.get('sleep_quality'),
-        entry_data.get('stress_level'),
-        entry_data.get('triggers_encountered'),
-        entry_data.get('physical_symptoms'),
-        entry_data.get('coping_strategies'),
-        entry_data.get('notes')
-    ))
+    if commit:
+        connection.commit()
+    return result
+
+def import_entries_dataframe(connection, entries_df):
+    """Bulk-load a DataFrame of entries (e.g. read from a CSV backup)
+
+    pandas writes ROWS_PER_STATEMENT rows per INSERT (method='multi'),
+    all inside one transaction. Only the ENTRY_COLUMNS are written - a
+    backup's id and created_timestamp are left for SQLite to fill in - and
+    dates that already have an entry are skipped.
+    Returns the number of rows added.
+    """
+    # Keep the entry columns, and the first row for each date
+    entries_df = entries_df[[column for column in ENTRY_COLUMNS if column in entries_df.columns]]
+    entries_df = entries_df.drop_duplicates(subset='date')
+    existing_dates = {row[0] for row in connection.execute("SELECT date FROM wellness_entries")}
+    entries_df = entries_df[~entries_df['date'].astype(str).isin(existing_dates)]
     
-    connection.commit()
-    return cursor.lastrowid
-
-def get_mood_trend(connection, days=7):
-    """Get mood trend for last N days"""
+    # total_changes counts every row SQLite has written on this connection,
+    # so the difference is exactly how many rows this import added
+    changes_before = connection.total_changes
+    with connection:
+        entries_df.to_sql(
+            'wellness_entries', connection,
+            if_exists='append', index=False,
+            method='multi', chunksize=ROWS_PER_STATEMENT
+        )
+    return connection.total_changes - changes_before
+
+def get_mood_trend(connection, days=7, chunksize=None):
+    """Get mood trend for last N days
+
+    Pass chunksize for long windows: you get an iterator of smaller
+    DataFrames instead of one big one, so memory use stays bounded.
+    """
     query = """
     SELECT date, mood_rating 
     FROM wellness_entries 
     ORDER BY date DESC 
     LIMIT ?
     """
-    return pd.read_sql_query(query, connection, params=[days])
+    return pd.read_sql_query(query, connection, params=[days], chunksize=chunksize)
 
 def check_entry_exists(connection, date):
     """Check if entry exists for a specific date"""
@@ -307,6 +387,7 @@ def check_entry_exists(connection, date):
 # Test the functions
 print("✅ Utility functions defined:")
 print("   - add_wellness_entry()")
+print("   - import_entries_dataframe()")
 print("   - get_mood_trend()")
 print("   - check_entry_exists()")
 
@@ -323,16 +404,36 @@ print("\n🔧 STEP 8: Database Maintenance")
 print("-" * 40)
 
 # Get database size
-db_size = os.path.getsize(database_name)
-print(f"💾 Database size: {db_size} bytes ({db_size/1024:.1f} KB)")
-
-# Optimize database (removes unused space)
-cursor.execute("VACUUM")
-connection.commit()
-print("✅ Database optimized (VACUUM completed)")
+current_size = db_size()
+print(f"💾 Database size: {current_size} bytes ({current_size/1024:.1f} KB)")
+
+# Reclaim unused space only when there's enough of it to matter.
+# A full VACUUM rewrites the whole file, so we avoid running it every time.
+FREE_PAGES_THRESHOLD = 100
+free_pages = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]  # 0 = off, 2 = incremental
+
+if auto_vacuum == 0:
+    # Databases made before auto_vacuum was switched on ignore the setting
+    # until the file is rewritten, so do one full VACUUM to switch it on
+    # (later runs can then reclaim space in small steps)
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    connection.commit()
+    cursor.execute("VACUUM")
+    free_after = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+    print(f"✅ Database rewritten with incremental auto-vacuum ({free_pages - free_after} free pages reclaimed)")
+    new_size = db_size()
+elif free_pages > FREE_PAGES_THRESHOLD:
+    # executescript steps the pragma until it's done - cursor.execute() would
+    # only take a single step and free just one page
+    connection.executescript("PRAGMA incremental_vacuum;")
+    free_after = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+    print(f"✅ Database optimised ({free_pages - free_after} free pages reclaimed)")
+    new_size = db_size()  # only changes if space was reclaimed
+else:
+    print(f"✅ No optimisation needed ({free_pages} free pages)")
+    new_size = current_size
 
-# Get updated size
-new_size = os.path.getsize(database_name)
 print(f"💾 Optimized size: {new_size} bytes ({new_size/1024:.1f} KB)")
 
 # ===============================
@@ -346,7 +447,10 @@ def safe_add_entry(connection, entry_data):
     """Safely add entry with error handling"""
     try:
         entry_id = add_wellness_entry(connection, entry_data)
-        print(f"✅ Entry added successfully with ID: {entry_id}")
+        if entry_id is None:
+            print(f"⚠️ An entry for {entry_data.get('date')} already exists - skipped")
+        else:
+            print(f"✅ Entry added successfully with ID: {entry_id}")
         return entry_id
     except sqlite3.IntegrityError as e:
         print(f"❌ Data validation error: {e}")
@@ -377,7 +481,8 @@ safe_add_entry(connection, invalid_entry)
 print("\n🎉 SETUP COMPLETE!")
 print("=" * 50)
 
-final_count = pd.read_sql_query("SELECT COUNT(*) as count FROM wellness_entries", connection)['count'][0]
+# A single number only needs a plain cursor - no DataFrame required
+final_count = cursor.execute("SELECT COUNT(*) FROM wellness_entries").fetchone()[0]
 
 print(f"""
 ✅ YOUR SQLITE DATABASE IS READY!
@@ -385,14 +490,14 @@ print(f"""
 📊 Database Stats:
    - File: {database_name}
    - Total entries: {final_count}
-   - Size: {os.path.getsize(database_name)} bytes
-   - Location: {os.path.abspath(database_name)}
+   - Size: {new_size} bytes
+   - Location: {DB_PATH}
 
 🛠️ What You Can Do Now:
    1. Run your Streamlit app with this database
    2. Add new wellness entries
    3. Query your data with SQL
-   4. Create backups with pandas
+   4. Create CSV backups
    5. View trends and analytics
 
 🚀 Next Steps:
@@ -405,7 +510,8 @@ print(f"""
    - {backup_filename} (backup file)
 """)
 
-# Close connection properly
+# Let SQLite refresh its query planner statistics, then close properly
+cursor.execute("PRAGMA optimize")
 connection.close()
 print("\n🔒 Database connection closed safely")
 
@@ -18,8 +18,6 @@ HOW TO RUN IN VS CODE:
 
 import os
 import sqlite3
-import pandas as pd
-from datetime import datetime
 
 print("🔍 DATABASE VERIFICATION TEST")
 print("=" * 40)
@@ -34,7 +32,9 @@ database_file = "wellness_tracker.db"
 
 if os.path.exists(database_file):
     print(f"✅ Database file found: {database_file}")
-    file_size = os.path.getsize(database_file)
+    # New writes sit in the -wal file until a checkpoint, so count that too
+    from wellness_helpers import database_size_bytes
+    file_size = database_size_bytes(database_file)
     print(f"📊 File size: {file_size} bytes ({file_size/1024:.1f} KB)")
     print(f"📍 Full path: {os.path.abspath(database_file)}")
 else:
@@ -51,6 +51,15 @@ print("\n🔌 TEST 2: Connecting to database...")
 try:
     conn = sqlite3.connect(database_file)
     cursor = conn.cursor()
+    # Same speed-up settings as sqlite_setup_complete.py
+    # (synchronous=NORMAL is safe once the database is in WAL mode)
+    cursor.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+    """)
     print("✅ Successfully connected to database")
 except Exception as e:
     print(f"❌ Connection failed: {e}")
@@ -91,25 +100,29 @@ except Exception as e:
     print(f"❌ Error counting entries: {e}")
 
 # ===============================
-# TEST 5: Load data with pandas
+# TEST 5: Summarise data with SQL
 # ===============================
 
-print("\n🐼 TEST 5: Loading data with pandas...")
+print("\n📊 TEST 5: Summarising data with SQL...")
 
 try:
-    # Load all data
-    df = pd.read_sql_query("SELECT * FROM wellness_entries", conn)
-    print(f"✅ Pandas loaded {len(df)} rows")
-    print(f"📊 Columns: {list(df.columns)}")
+    # Let SQLite do the maths and send back a single row
+    # (no need to load every entry into pandas just to average a few columns)
+    from wellness_helpers import summarize  # the same query sqlite_setup_complete.py uses
     
-    if len(df) > 0:
-        print(f"📅 Date range: {df['date'].min()} to {df['date'].max()}")
-        print(f"😊 Average mood: {df['mood_rating'].mean():.1f}/10")
-        print(f"⚡ Average energy: {df['energy_level'].mean():.1f}/10")
-        print(f"💤 Average sleep: {df['sleep_hours'].mean():.1f} hours")
+    avg_mood, avg_energy, avg_sleep, row_count, first_date, last_date = summarize(conn)
+    columns = [col[1] for col in cursor.execute("PRAGMA table_info(wellness_entries)")]
+    print(f"✅ Summarised {row_count} rows")
+    print(f"📊 Columns: {columns}")
+    
+    if row_count > 0:
+        print(f"📅 Date range: {first_date} to {last_date}")
+        print(f"😊 Average mood: {avg_mood:.1f}/10")
+        print(f"⚡ Average energy: {avg_energy:.1f}/10")
+        print(f"💤 Average sleep: {avg_sleep:.1f} hours")
         
 except Exception as e:
-    print(f"❌ Pandas error: {e}")
+    print(f"❌ Summary error: {e}")
 
 # ===============================
 # TEST 6: Show sample data
@@ -152,7 +165,9 @@ print("\n✏️ TEST 7: Testing insert operation...")
 try:
     # Try to insert a test entry
     test_entry = {
-        'date': datetime.now().strftime('%Y-%m-%d'),
+        # Fixed date far in the past so it never clashes with a real
+        # entry (there can only be one entry per date)
+        'date': '1900-01-01',
         'tracking_reason': '🧪 Database test',
         'mood_rating': 8,
         'safety_level': 8, 
@@ -198,19 +213,28 @@ except Exception as e:
 
 print("\n🚀 TEST 8: Streamlit compatibility...")
 
+pandas_compatible = False
 try:
     # Test if we can use the database the way Streamlit will
-    def streamlit_style_query(conn):
-        return pd.read_sql_query(
-            "SELECT date, mood_rating, energy_level FROM wellness_entries ORDER BY date DESC LIMIT 5", 
-            conn
-        )
+    # (plain tuples are enough to count rows - only build a DataFrame when asked)
+    def streamlit_style_query(conn, as_dataframe=False):
+        query = "SELECT date, mood_rating, energy_level FROM wellness_entries ORDER BY date DESC LIMIT 5"
+        if as_dataframe:
+            import pandas as pd  # only loaded when a DataFrame is really needed
+            return pd.read_sql_query(query, conn)
+        return conn.execute(query).fetchall()
     
-    streamlit_df = streamlit_style_query(conn)
-    print(f"✅ Streamlit-style query successful: {len(streamlit_df)} rows")
+    streamlit_rows = streamlit_style_query(conn)
+    print(f"✅ Streamlit-style query successful: {len(streamlit_rows)} rows")
+    
+    # Build the DataFrame once too, since the charts in the app need one
+    streamlit_df = streamlit_style_query(conn, as_dataframe=True)
+    assert len(streamlit_df) == len(streamlit_rows)
+    pandas_compatible = True
+    print(f"✅ Pandas DataFrame loaded: {len(streamlit_df)} rows")
     
     # Test session-state style operations
-    if len(streamlit_df) > 0:
+    if len(streamlit_rows) > 0:
         print("✅ Data ready for Streamlit visualizations")
     else:
         print("⚠️ No data for Streamlit to display")
@@ -218,6 +242,76 @@ try:
 except Exception as e:
     print(f"❌ Streamlit compatibility issue: {e}")
 
+# ===============================
+# TEST 9: Sidebar best/worst days skip blank moods
+# ===============================
+
+print("\n🌟 TEST 9: Sidebar best and worst mood days...")
+
+try:
+    import datetime
+    from wellness_helpers import STATS_SQL, sidebar_stats
+    
+    # A throwaway in-memory database, so your real entries aren't touched
+    test_conn = sqlite3.connect(":memory:")
+    test_conn.execute("""
+        CREATE TABLE wellness_entries (
+            id INTEGER PRIMARY KEY, date TEXT, mood_rating INTEGER, energy_level INTEGER,
+            safety_level INTEGER, daily_win TEXT, created_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    test_conn.executescript(STATS_SQL)
+    test_conn.executemany(
+        "INSERT INTO wellness_entries (date, mood_rating, energy_level, safety_level, daily_win) VALUES (?, ?, 5, 5, '')",
+        [('2023-12-01', None), ('2023-12-02', 3), ('2023-12-03', 8)]
+    )
+    
+    stats = sidebar_stats(test_conn, datetime.date(2023, 12, 4))
+    assert (stats['worst_date'], stats['worst_mood']) == ('02/12/2023', 3), stats
+    assert (stats['best_date'], stats['best_mood']) == ('03/12/2023', 8), stats
+    assert stats['total_entries'] == 3 and stats['avg_mood'] == 5.5, stats
+    test_conn.close()
+    print("✅ An entry without a mood rating is never picked as the best or worst day")
+    
+except Exception as e:
+    print(f"❌ Sidebar stats test failed: {e}")
+
+# ===============================
+# TEST 10: Importing old CSV backups
+# ===============================
+
+print("\n📥 TEST 10: Reading old CSV backups...")
+
+try:
+    import io
+    from wellness_helpers import read_entries_csv
+    
+    # The backup that ships with the project (plain "A, B" and "None" list cells)
+    backup_entries = read_entries_csv("wellness_backup_20250920_222146.csv")
+    assert len(backup_entries) == 3, backup_entries
+    assert backup_entries[0]['coping_strategies'] == ['Deep breathing', 'Journaling'], backup_entries[0]
+    assert backup_entries[0].get('physical_symptoms', []) == [], backup_entries[0]  # "None" reads as blank
+    print(f"✅ Bundled backup read: {len(backup_entries)} entries")
+    
+    # Exports from before the JSON change wrote Python-style lists
+    old_export = io.StringIO(
+        "date,mood_rating,movement_type,coping_strategies\n"
+        "2024-02-01,6,\"['Yoga']\",\"[\"\"Journaling\"\"]\"\n"
+    )
+    old_entry = read_entries_csv(old_export)[0]
+    assert old_entry['movement_type'] == ['Yoga'] and old_entry['coping_strategies'] == ['Journaling'], old_entry
+    print("✅ Python-style ['Yoga'] and JSON [\"Journaling\"] list cells both read")
+    
+    # A broken list cell is reported by row and column
+    try:
+        read_entries_csv(io.StringIO("date,movement_type\n2024-02-01,\"['Yoga'\"\n"))
+        print("❌ A broken list cell was not reported")
+    except ValueError as e:
+        print(f"✅ Broken cell reported: {e}")
+    
+except Exception as e:
+    print(f"❌ CSV backup test failed: {e}")
+
 # ===============================
 # FINAL RESULTS
 # ===============================
@@ -238,7 +332,7 @@ if final_count > 0:
    - Connection: ✅ Working  
    - Tables: ✅ Created
    - Data: ✅ {final_count} entries ready
-   - Pandas: ✅ Compatible
+   - Pandas: {"✅ Compatible" if pandas_compatible else "❌ Not working"}
    - Streamlit: ✅ Ready
 
 🚀 You can now:
@@ -265,7 +359,8 @@ else:
    3. Then run this verification again
 """)
 
-# Close connection
+# Refresh query planner statistics, then close connection
+cursor.execute("PRAGMA optimize")
 conn.close()
 print("\n🔒 Database connection closed safely")
 
@@ -0,0 +1,263 @@
+# wellness_helpers.py - Database and helper code for the wellness tracker (nothing drawn here)
+
+"""
+WELLNESS HELPERS
+================
+
+wellness_tracker_complete.py is a Streamlit script, so Streamlit runs it from
+top to bottom on every rerun. Code in this module is imported instead, which
+means Python loads it once - its constants are built once and its caches last.
+It doesn't use Streamlit at all, so test_database.py can import it too.
+"""
+
+import ast                      # Reading old Python-style list values
+import enum                     # Named number choices for the select boxes
+import functools                # Remembering results of small helper functions
+import json                     # Multi-select fields are stored as JSON lists
+import os                       # Checking file sizes
+
+# ===============================
+# TRACKING REASONS AND CYCLE PHASES
+# ===============================
+
+@functools.lru_cache(maxsize=16)
+def reason_parts(tracking_reason):
+    """Tracking reason without its emoji, plus its Title Case and lower-case forms"""
+    reason_display = tracking_reason.split(" ", 1)[1]
+    return reason_display, reason_display.title(), reason_display.lower()
+
+# Keywords in a tracking reason that open matching check-in sections
+REASON_KEYWORDS = ("trauma", "anxiety", "depression", "chronic illness", "adhd", "hormonal")
+
+@functools.lru_cache(maxsize=16)
+def reason_tags(tracking_reason):
+    """Which REASON_KEYWORDS appear in the tracking reason (lower-cased once)"""
+    reason_lower = tracking_reason.lower()
+    return frozenset(keyword for keyword in REASON_KEYWORDS if keyword in reason_lower)
+
+# Cycle phases - the number doubles as the select box index
+class CyclePhase(enum.IntEnum):
+    MENSTRUAL = 0
+    FOLLICULAR = 1
+    OVULATORY = 2
+    LUTEAL = 3
+    EXTENDED_OR_IRREGULAR = 4
+    POST_MENOPAUSAL = 5
+    PERIMENOPAUSAL = 6
+
+@functools.lru_cache(maxsize=64)
+def get_cycle_phase(cycle_day):
+    """Estimate the cycle phase from the day of the cycle"""
+    if 1 <= cycle_day <= 5:
+        return CyclePhase.MENSTRUAL
+    elif 6 <= cycle_day <= 13:
+        return CyclePhase.FOLLICULAR
+    elif 14 <= cycle_day <= 16:
+        return CyclePhase.OVULATORY
+    elif 17 <= cycle_day <= 28:
+        return CyclePhase.LUTEAL
+    else:
+        return CyclePhase.EXTENDED_OR_IRREGULAR
+
+# ===============================
+# DATABASE FILES
+# ===============================
+
+def database_size_bytes(database_path):
+    """Size of the database on disk in bytes, counting its -wal file (None if it doesn't exist)
+
+    In WAL mode new writes go into "<database>-wal" first and only reach the
+    main file at a checkpoint, so the main file on its own looks too small.
+    """
+    try:
+        size = os.stat(database_path).st_size
+    except FileNotFoundError:
+        return None
+    try:
+        size += os.stat(database_path + "-wal").st_size
+    except FileNotFoundError:
+        pass  # no writes waiting (or not in WAL mode)
+    return size
+
+# ===============================
+# CSV IMPORTS
+# ===============================
+
+# Multi-select fields - stored as JSON lists so SQLite's JSON functions can read them
+LIST_COLUMNS = (
+    'movement_type', 'physical_symptoms', 'body_tension', 'trauma_responses',
+    'coping_strategies', 'support_types', 'hormonal_symptoms',
+    'grounding_techniques', 'tongue_shape', 'dampness_signs'
+)
+
+def parse_list_cell(value):
+    """Turn a multi-select cell from a CSV back into a list
+
+    Copes with every format the app has written: JSON (["Yoga"]), Python's
+    str(list) (['Yoga']) from older exports, and plain "Yoga, Walking" text
+    (or "None") from the earliest backups. Raises ValueError for a cell that
+    looks like a list but can't be read.
+    """
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            if value.lstrip().startswith('['):
+                raise ValueError(f"can't read {value!r} as a list")
+            parsed = [item.strip() for item in value.split(',') if item.strip()]
+    if parsed is None:
+        return []
+    if isinstance(parsed, (list, tuple)):
+        return list(parsed)
+    return [parsed]
+
+def read_entries_csv(uploaded_file):
+    """Read a wellness CSV (e.g. one exported from this app) into entry dictionaries
+
+    Raises ValueError naming the row and column of a cell that can't be read.
+    """
+    import pandas as pd  # only loaded when a CSV is really read
+    entries_df = pd.read_csv(uploaded_file)
+    entries = []
+    for row_number, record in enumerate(entries_df.to_dict('records'), start=1):
+        # Leave blank cells out so the save code fills in its defaults
+        entry = {key: value for key, value in record.items() if pd.notna(value)}
+        for column in LIST_COLUMNS:
+            if isinstance(entry.get(column), str):
+                try:
+                    entry[column] = parse_list_cell(entry[column])
+                except ValueError as e:
+                    raise ValueError(f"Row {row_number}, column '{column}': {e}") from e
+        entries.append(entry)
+    return entries
+
+# ===============================
+# SUMMARIES
+# ===============================
+
+def summarize(conn):
+    """Averages, entry count and date range - all from ONE query"""
+    return conn.execute("""
+        SELECT AVG(mood_rating), AVG(energy_level), AVG(sleep_hours),
+               COUNT(*), MIN(date), MAX(date)
+        FROM wellness_entries
+    """).fetchone()
+
+# ===============================
+# SIDEBAR STATS
+# ===============================
+
+# One-row running totals for the sidebar, kept up to date by triggers so the
+# averages don't need to read every entry (each average is just sum / count,
+# with count skipping blanks the way AVG() does). Updates (including upserts)
+# take the old values off and add the new ones; the INSERT OR IGNORE fills in
+# the totals the first time, from whatever entries are already saved.
+STATS_SQL = """
+    CREATE TABLE IF NOT EXISTS wellness_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        entry_count INTEGER NOT NULL,
+        mood_sum REAL NOT NULL, mood_count INTEGER NOT NULL,
+        energy_sum REAL NOT NULL, energy_count INTEGER NOT NULL,
+        safety_sum REAL NOT NULL, safety_count INTEGER NOT NULL
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS wellness_stats_insert AFTER INSERT ON wellness_entries BEGIN
+        UPDATE wellness_stats SET
+            entry_count = entry_count + 1,
+            mood_sum = mood_sum + COALESCE(NEW.mood_rating, 0),
+            mood_count = mood_count + (NEW.mood_rating IS NOT NULL),
+            energy_sum = energy_sum + COALESCE(NEW.energy_level, 0),
+            energy_count = energy_count + (NEW.energy_level IS NOT NULL),
+            safety_sum = safety_sum + COALESCE(NEW.safety_level, 0),
+            safety_count = safety_count + (NEW.safety_level IS NOT NULL)
+        WHERE id = 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS wellness_stats_delete AFTER DELETE ON wellness_entries BEGIN
+        UPDATE wellness_stats SET
+            entry_count = entry_count - 1,
+            mood_sum = mood_sum - COALESCE(OLD.mood_rating, 0),
+            mood_count = mood_count - (OLD.mood_rating IS NOT NULL),
+            energy_sum = energy_sum - COALESCE(OLD.energy_level, 0),
+            energy_count = energy_count - (OLD.energy_level IS NOT NULL),
+            safety_sum = safety_sum - COALESCE(OLD.safety_level, 0),
+            safety_count = safety_count - (OLD.safety_level IS NOT NULL)
+        WHERE id = 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS wellness_stats_update
+    AFTER UPDATE OF mood_rating, energy_level, safety_level ON wellness_entries BEGIN
+        UPDATE wellness_stats SET
+            mood_sum = mood_sum - COALESCE(OLD.mood_rating, 0) + COALESCE(NEW.mood_rating, 0),
+            mood_count = mood_count - (OLD.mood_rating IS NOT NULL) + (NEW.mood_rating IS NOT NULL),
+            energy_sum = energy_sum - COALESCE(OLD.energy_level, 0) + COALESCE(NEW.energy_level, 0),
+            energy_count = energy_count - (OLD.energy_level IS NOT NULL) + (NEW.energy_level IS NOT NULL),
+            safety_sum = safety_sum - COALESCE(OLD.safety_level, 0) + COALESCE(NEW.safety_level, 0),
+            safety_count = safety_count - (OLD.safety_level IS NOT NULL) + (NEW.safety_level IS NOT NULL)
+        WHERE id = 1;
+    END;
+    
+    INSERT OR IGNORE INTO wellness_stats
+    SELECT 1, COUNT(*),
+           TOTAL(mood_rating), COUNT(mood_rating),
+           TOTAL(energy_level), COUNT(energy_level),
+           TOTAL(safety_level), COUNT(safety_level)
+    FROM wellness_entries;
+"""
+
+# Every sidebar number comes back in one row from one query:
+# - count and averages from the running totals in wellness_stats
+# - latest date, newest/oldest 3 moods from the date index
+# - best/worst days from the (mood_rating, date) index: MAX/MIN find the
+#   rating at either end, then the newest day with that rating wins a tie.
+#   MAX/MIN skip blank moods, so entries without a mood rating are left out
+#   just like the averages leave out blanks
+# (today is passed in rather than using 'now', which SQLite takes as UTC)
+SIDEBAR_STATS_SQL = """
+    WITH totals AS (
+        SELECT entry_count AS total_entries,
+               mood_sum / NULLIF(mood_count, 0) AS avg_mood,
+               energy_sum / NULLIF(energy_count, 0) AS avg_energy,
+               safety_sum / NULLIF(safety_count, 0) AS avg_safety,
+               CAST(julianday(?) - julianday((SELECT MAX(date) FROM wellness_entries)) AS INTEGER)
+                   AS days_since_last
+        FROM wellness_stats WHERE id = 1
+    ),
+    best AS (
+        SELECT strftime('%d/%m/%Y', date) AS best_date, mood_rating AS best_mood, daily_win AS best_win
+        FROM wellness_entries WHERE mood_rating = (SELECT MAX(mood_rating) FROM wellness_entries)
+        ORDER BY date DESC LIMIT 1
+    ),
+    worst AS (
+        SELECT strftime('%d/%m/%Y', date) AS worst_date, mood_rating AS worst_mood
+        FROM wellness_entries WHERE mood_rating = (SELECT MIN(mood_rating) FROM wellness_entries)
+        ORDER BY date DESC LIMIT 1
+    ),
+    recent AS (
+        SELECT AVG(mood_rating) AS recent_avg FROM (
+            SELECT mood_rating FROM wellness_entries ORDER BY date DESC, created_timestamp DESC LIMIT 3
+        )
+    ),
+    older AS (
+        SELECT AVG(mood_rating) AS older_avg FROM (
+            SELECT mood_rating FROM wellness_entries ORDER BY date ASC, created_timestamp ASC LIMIT 3
+        )
+    )
+    SELECT * FROM totals LEFT JOIN best ON 1 LEFT JOIN worst ON 1, recent, older
+"""
+
+def sidebar_stats(conn, today):
+    """Numbers for the sidebar's Quick Stats as a dict (None if there are no entries yet)"""
+    cursor = conn.execute(SIDEBAR_STATS_SQL, (today.isoformat(),))
+    stats = dict(zip([description[0] for description in cursor.description], cursor.fetchone()))
+    if stats['total_entries'] == 0:
+        return None
+    # Trend indicator needs a week of entries: -1 worse, 0 stable, 1 improving
+    recent_avg, older_avg = stats.pop('recent_avg'), stats.pop('older_avg')
+    if stats['total_entries'] >= 7 and recent_avg is not None and older_avg is not None:
+        stats['trend'] = (recent_avg > older_avg) - (recent_avg < older_avg)
+    else:
+        stats['trend'] = None
+    return stats
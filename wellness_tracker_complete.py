@@ -3,12 +3,23 @@
 import streamlit as st           # Web app framework
 import pandas as pd             # Data handling
 import datetime                 # Date operations
-import plotly.express as px     # Interactive charts
-import plotly.graph_objects as go  # Advanced charts
 import numpy as np              # Maths operations
-import calendar                 # Calendar operations
 import sqlite3                  # Database connection
+import json                     # Multi-select fields are stored as JSON lists
 import os                       # File operations
+import atexit                   # Tidy-up when the app shuts down
+import threading                # One writer at a time on the shared connection
+import csv                      # Writing exports straight from the database
+import io                       # In-memory file for the CSV export
+import enum                     # Named number choices for the select boxes
+
+# Non-drawing helpers live in their own module (imported once, not re-run every
+# rerun, so their lru_caches keep what they've remembered)
+from wellness_helpers import (
+    LIST_COLUMNS, STATS_SQL, CyclePhase,
+    database_size_bytes, get_cycle_phase, parse_list_cell, read_entries_csv,
+    reason_parts, reason_tags, sidebar_stats
+)
 
 # Page configuration - trauma-informed design with calming colours
 st.set_page_config(
@@ -19,261 +30,924 @@ st.set_page_config(
 )
 
 # Custom CSS for brand-aligned, trauma-informed design
-st.markdown("""
-<style>
-    .main { background-color: #f2f5e7; }
-    
-    .stSelectbox, .stSlider, .stTextInput, .stTextArea {
-        margin-bottom: 1rem;
-    }
-    
-    .section-header {
-        background: linear-gradient(90deg, #f2f5e7, #0096c7);
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        color: #14213d;
-    }
-    
-    .habit-streak {
-        background: linear-gradient(45deg, #0096c7, #00496c);
-        color: white;
-        padding: 1rem;
-        border-radius: 1rem;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .section-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 0.8rem;
-        margin-bottom: 1rem;
-        border-left: 4px solid #0096c7;
-    }
-    .optional-section {
-        background: #f2f5e7;
-        padding: 1rem;
-        border-radius: 0.8rem;
-        margin-bottom: 1rem;
-        border-left: 4px solid #ffe812;
-    }
-    
-    .calendar-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 1rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 1rem;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #0096c7 0%, #14213d 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 0.8rem;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# (kept in style.css and read from disk only once per server process)
+@st.cache_resource
+def _load_css():
+    """Read style.css once and wrap it in a <style> tag"""
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css")
+    with open(css_path, encoding="utf-8") as css_file:
+        return f"<style>\n{css_file.read()}</style>"
+
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+# ===============================
+# HTML SNIPPETS (module-level, so fragment reruns reuse them)
+# ===============================
+
+WELCOME_HEADER_HTML = """
+<div class="section-header">
+    <h3>🌟 Daily Tracking + Visual Insights</h3>
+    <p>Track your wellness patterns, view beautiful calendar insights, and understand your unique health journey</p>
+</div>
+"""
+
+CHECKIN_HEADER_HTML = """
+<div class="section-header">
+    <h3>📝 Your Daily Wellness Check-In</h3>
+    <p>This is your safe space to track your wellness journey. Go at your own pace, 
+    and remember - there are no right or wrong answers, only your truth.</p>
+</div>
+"""
+
+HABIT_STREAK_HTML = """
+<div class="habit-streak">
+    <h3>🔥 Your Daily Wellness Journey</h3>
+    <p><strong>You showed up today - that's what matters most!</strong></p>
+    <p>Daily consistency beats perfection every time</p>
+</div>
+"""
+
+# Every section card has the same shape - only the title and subtitle change.
+# They are all filled in here at the top of the script, so a fragment rerun
+# (e.g. one check-in section) reuses them. A full rerun runs this whole
+# script again, so they're filled in again then - it's only a few strings.
+# (The optional Growth and TCM cards live with their sections in sections/.)
+SECTION_CARD_TEMPLATE = """
+<div class="section-card">
+    <h3>{title}</h3>
+    <p>{subtitle}</p>
+</div>
+"""
+
+# Divider and essentials card go out as one element
+ESSENTIALS_CARD_HTML = "\n---\n" + SECTION_CARD_TEMPLATE.format(
+    title="🎯 Daily Essentials (Required - 2 minutes)",
+    subtitle="These 6 questions are the foundation of your healing. Never skip these!"
+)
 
-# Initialize session state for data storage
-if 'wellness_data' not in st.session_state:
-    st.session_state.wellness_data = []
+SAFETY_CARD_HTML = SECTION_CARD_TEMPLATE.format(
+    title="🛡️ Safety & Grounding",
+    subtitle="Your nervous system needs extra attention today"
+)
+
+PHYSICAL_CARD_HTML = SECTION_CARD_TEMPLATE.format(
+    title="💪 Physical Wellness",
+    subtitle="The body keeps the score - let's listen to what it's saying"
+)
+
+EMOTIONAL_CARD_HTML = SECTION_CARD_TEMPLATE.format(
+    title="💙 Emotional & Trauma Responses",
+    subtitle="Your emotions are information, not problems to fix"
+)
+
+CONNECTION_CARD_HTML = SECTION_CARD_TEMPLATE.format(
+    title="🤗 Connection & Support",
+    subtitle="Healing happens in relationship - every connection matters"
+)
+
+MENSTRUAL_CARD_HTML = SECTION_CARD_TEMPLATE.format(
+    title="🌸 Menstrual & Hormonal Health",
+    subtitle="Hormones affect everything: mood, energy, pain, digestion, sleep, and mental clarity"
+)
+
+HABIT_STREAK_HTML_TEMPLATE = """
+<div class="habit-streak">
+    <h3>🔥 Day {streak_day} of Your {reason_title} Journey</h3>
+    <p><strong>You're taking charge of your {reason_lower} - that's incredibly brave!</strong></p>
+    <p>Daily consistency is the key to understanding your patterns and healing</p>
+</div>
+"""
+
+
+@st.cache_data(max_entries=32)
+def _habit_streak_html(reason_title, reason_lower, streak_day):
+    """Fill in the habit-streak card for a tracking reason"""
+    return HABIT_STREAK_HTML_TEMPLATE.format(
+        reason_title=reason_title, reason_lower=reason_lower, streak_day=streak_day
+    )
+
+FOOTER_HTML_TEMPLATE = """
+<div style='text-align: center; color: #666; padding: 1rem;'>
+    💙 <strong>Your Wellness Tracker</strong> • 
+    Built with care for your healing journey • 
+    Last updated: {current_time} • 
+    🇦🇺 Made in Australia
+</div>
+"""
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _footer_html():
+    """Footer with the current time (only shown to the minute, so filled in once a minute)"""
+    return FOOTER_HTML_TEMPLATE.format(current_time=datetime.datetime.now().strftime('%d/%m/%Y %H:%M'))
+
+# Australian crisis resources for the sidebar
+CRISIS_SUPPORT_MD = """
+**If you're in crisis, please reach out:**
+
+🔴 **Emergency:** 000
+
+📞 **Mental Health Crisis:**
+- Lifeline: 13 11 14
+- Suicide Call Back Service: 1300 659 467
+- Kids Helpline: 1800 55 1800
+
+💬 **24/7 Text Support:**
+- Crisis Text Line: Text HELLO to 741741
+
+🌐 **Online Support:**
+- Beyond Blue: beyondblue.org.au
+- Headspace: headspace.org.au
+- SANE Australia: sane.org
+
+**You matter. Your life has value. ❤️**
+"""
+
+# ===============================
+# CHECK-IN OPTION LISTS (module-level tuples, so fragment reruns reuse them)
+# ===============================
+
+TRACKING_REASONS = (
+    "Select your primary focus...",
+    "🌸 Hormonal changes (PMS, menopause, cycles)",
+    "🧠 Trauma recovery & PTSD healing",
+    "😔 Depression & mood support",
+    "😰 Anxiety & stress management",
+    "⚡ ADHD & neurodivergence support",
+    "🩺 Chronic illness management",
+    "💊 Medication monitoring",
+    "🌱 General wellness & self-care",
+    "🔄 Life transitions & major changes"
+)
+
+GENDER_OPTIONS = (
+    "Prefer not to say",
+    "Female",
+    "Male",
+    "Non-binary",
+    "Transgender female",
+    "Transgender male",
+    "Other"
+)
+
+SOCIAL_CONNECTION_OPTIONS = (
+    "Select an option...",
+    "Deep, meaningful connections",
+    "Good interactions - felt heard",
+    "Surface-level interactions only",
+    "Minimal social contact",
+    "Completely isolated"
+)
+
+BODY_AWARENESS_OPTIONS = (
+    "Select...",
+    "Felt connected and aware",
+    "Somewhat connected",
+    "Disconnected or numb",
+    "Very dissociated"
+)
+
+GROUNDING_TECHNIQUES = (
+    "5-4-3-2-1 sensory technique",
+    "Deep breathing/box breathing",
+    "Cold water on face/hands",
+    "Progressive muscle relaxation",
+    "Mindful movement/stretching",
+    "Time in nature",
+    "Hold ice cube/cold object",
+    "Stomp feet/feel ground connection",
+    "Count backwards from 100 by 7s",
+    "Name items in categories",
+    "Self-talk (name, place, date)",
+    "Touch different textures",
+    "Essential oils/calming scents",
+    "Warm then cold water on hands",
+    "Mindful eating (mint, lemon)",
+    "Physical movement/exercise",
+    "Grounding phrases/affirmations",
+    "None today"
+)
+
+EXERCISE_OPTIONS = ("Yes", "A little", "No")
+
+MOVEMENT_TYPES = (
+    "Walking",
+    "Yoga",
+    "Stretching",
+    "Dancing",
+    "Running",
+    "Strength training",
+    "Sports",
+    "Cleaning/housework",
+    "Playing with pets"
+)
+
+BOWEL_FREQUENCY_OPTIONS = (
+    "0",
+    "1",
+    "2",
+    "3",
+    "4+"
+)
+
+BRISTOL_SCALE = (
+    "Select...",
+    "Type 1: Hard lumps (severe constipation)",
+    "Type 2: Lumpy sausage (mild constipation)",
+    "Type 3: Sausage with cracks (normal-dry)",
+    "Type 4: Smooth sausage (ideal)",
+    "Type 5: Soft blobs (lacking fibre)",
+    "Type 6: Mushy (mild diarrhoea)",
+    "Type 7: Liquid (diarrhoea)"
+)
+
+# The select box holds the Bristol type number; the label is only used for display
+class BristolType(enum.IntEnum):
+    NOT_SELECTED = 0
+    HARD_LUMPS = 1
+    LUMPY_SAUSAGE = 2
+    CRACKED_SAUSAGE = 3
+    SMOOTH_SAUSAGE = 4
+    SOFT_BLOBS = 5
+    MUSHY = 6
+    LIQUID = 7
+
+BRISTOL_LABELS = dict(zip(BristolType, BRISTOL_SCALE))
+
+DIGESTIVE_SOUNDS_OPTIONS = (
+    "Select...",
+    "Normal occasional rumbles when hungry",
+    "Very quiet/no sounds noticed",
+    "Frequent loud rumbling throughout day",
+    "Excessive gurgling after meals",
+    "Rumbling increases when anxious/stressed",
+    "Embarrassingly loud in quiet situations",
+    "Didn't pay attention to this"
+)
+
+PHYSICAL_SYMPTOMS = (
+    "Headaches",
+    "Muscle tension",
+    "Fatigue",
+    "Digestive issues",
+    "Heart racing",
+    "Shortness of breath",
+    "None today"
+)
+
+BODY_TENSION_AREAS = (
+    "Neck",
+    "Shoulders",
+    "Jaw",
+    "Back",
+    "Stomach",
+    "Chest",
+    "Everywhere",
+    "None"
+)
+
+TRAUMA_RESPONSES = (
+    "Flashbacks/intrusive thoughts",
+    "Hypervigilance",
+    "Dissociation",
+    "Emotional numbness",
+    "Intense anger",
+    "Panic/anxiety",
+    "PTSD symptoms",
+    "None today"
+)
+
+TRIGGER_OPTIONS = ("Yes", "Maybe", "No")
+
+COPING_STRATEGIES = (
+    "Talked to someone",
+    "Deep breathing",
+    "Journaling",
+    "Creative expression",
+    "Time in nature",
+    "Meditation",
+    "None"
+)
+
+FELT_SUPPORTED_OPTIONS = (
+    "Yes, deeply supported",
+    "Somewhat supported",
+    "A little supported",
+    "Not really supported",
+    "Completely alone"
+)
+
+SUPPORT_TYPES = (
+    "Emotional support",
+    "Physical comfort",
+    "Practical help",
+    "Professional support",
+    "Pet companionship",
+    "Online community",
+    "None today"
+)
+
+RELATIONSHIP_CONFLICT_OPTIONS = (
+    "Select...",
+    "None - peaceful day",
+    "Minor disagreement",
+    "Moderate conflict",
+    "Major argument",
+    "Felt unsafe with someone"
+)
+
+PERIOD_STATUS_OPTIONS = (
+    "Select...",
+    "Heavy flow (changing pad/tampon every 1-2 hours)",
+    "Medium flow (changing every 3-4 hours)",
+    "Light flow (changing every 4-6 hours)",
+    "Spotting (very light bleeding)",
+    "No bleeding today",
+    "PMS symptoms (before period)",
+    "Ovulation signs (mid-cycle)",
+    "Post-period recovery"
+)
+
+HORMONAL_SYMPTOMS = (
+    "Breast tenderness",
+    "Bloating/water retention",
+    "Menstrual cramps",
+    "Lower back pain",
+    "Mood swings",
+    "Food cravings",
+    "Acne breakouts",
+    "Headaches/migraines",
+    "Fatigue",
+    "Irritability",
+    "Hot flushes",
+    "Night sweats",
+    "None today"
+)
+
+BIRTH_CONTROL_OPTIONS = ("Yes", "No", "Prefer not to say")
+
+MISSED_PILLS_OPTIONS = (
+    "No missed pills",
+    "Missed 1 pill this week",
+    "Missed 2-3 pills this week",
+    "Missed more than 3 pills",
+    "Irregular pill timing"
+)
+
+PHASE_OPTIONS = (
+    "Menstrual phase (Days 1-5)",
+    "Follicular phase (Days 6-13)",
+    "Ovulatory phase (Days 14-16)",
+    "Luteal phase (Days 17-28)",
+    "Extended cycle/Irregular",
+    "Post-menopausal",
+    "Perimenopausal"
+)
+
+# Same idea for the cycle phase (CyclePhase lives in wellness_helpers.py with get_cycle_phase)
+PHASE_LABELS = dict(zip(CyclePhase, PHASE_OPTIONS))
+
+# Starting values for follow-up questions that only appear after a "Yes"
+# (stored under each widget's key)
+FOLLOW_UP_DEFAULTS = {
+    'movement_type': [],
+    'trigger_impact': 5,
+    'pill_day': 1,
+    'started_new_pack': False,
+    'missed_pills': "No missed pills"
+}
+
+# Newest-first index (also dropped and rebuilt around bulk imports)
+DATE_CREATED_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_entries_date_created
+    ON wellness_entries(date DESC, created_timestamp DESC)
+"""
+
+class _DB:
+    """The shared SQLite connection plus a lock that writers hold
+
+    Reads just use db.conn (WAL lets them run alongside a write), but two
+    threads writing through the same connection could mix up each other's
+    transactions, so every write happens inside "with db.lock, db.conn:".
+    can_upsert is False for older databases with more than one entry on a
+    day (no unique index on date to upsert against) or a very old SQLite.
+    """
+    def __init__(self, conn, can_upsert=True):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.can_upsert = can_upsert
+
+# Upserts (ON CONFLICT) need SQLite 3.24+, and getting the id back with RETURNING needs 3.35+
+SQLITE_HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Connection settings, table and newest-first index, sent to SQLite in one executescript call.
+# WAL journal: readers don't block the writer and commits need fewer fsyncs
+# (synchronous=NORMAL is safe in WAL mode). A bigger page cache, in-memory
+# temp tables and memory-mapped reads keep repeat queries off the disk.
+SCHEMA_SQL = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-20000;       -- about 20 MB
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;     -- 256 MB
+    PRAGMA threads=4;               -- helper threads for big sorts
+    PRAGMA foreign_keys=ON;         -- off by default in SQLite; on so any REFERENCES links are enforced
+    
+    CREATE TABLE IF NOT EXISTS wellness_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        tracking_reason TEXT,
+        mood_rating INTEGER,
+        safety_level INTEGER,
+        energy_level INTEGER,
+        sleep_hours REAL,
+        water_intake REAL,
+        social_connection TEXT,
+        daily_win TEXT,
+        quick_mode BOOLEAN,
+        
+        -- Physical wellness
+        exercise_today TEXT,
+        movement_type TEXT,
+        sleep_quality INTEGER,
+        bowel_frequency TEXT,
+        bowel_quality TEXT,
+        digestive_sounds TEXT,
+        physical_symptoms TEXT,
+        body_tension TEXT,
+        
+        -- Emotional & trauma responses
+        stress_level INTEGER,
+        patience_level INTEGER,
+        trauma_responses TEXT,
+        triggers_today TEXT,
+        trigger_impact INTEGER,
+        coping_strategies TEXT,
+        
+        -- Connection & support
+        felt_supported TEXT,
+        safe_people_time REAL,
+        support_types TEXT,
+        relationship_conflicts TEXT,
+        
+        -- Menstrual & hormonal health
+        cycle_day INTEGER,
+        period_status TEXT,
+        hormonal_symptoms TEXT,
+        on_birth_control TEXT,
+        pill_day INTEGER,
+        started_new_pack BOOLEAN,
+        missed_pills TEXT,
+        estimated_phase TEXT,
+        period_pain INTEGER,
+        
+        -- Grounding & safety
+        body_awareness TEXT,
+        hypervigilance INTEGER,
+        grounding_techniques TEXT,
+        present_moment INTEGER,
+        
+        -- Growth & meaning
+        mindfulness_minutes INTEGER,
+        gratitude TEXT,
+        self_compassion INTEGER,
+        hope_level INTEGER,
+        
+        -- TCM indicators
+        tongue_colour TEXT,
+        tongue_coating TEXT,
+        tongue_shape TEXT,
+        qi_energy INTEGER,
+        body_temperature TEXT,
+        dampness_signs TEXT,
+        emotional_element TEXT,
+        
+        notes TEXT,
+        created_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+""" + DATE_CREATED_INDEX_SQL + """;
+    -- Sidebar best/worst days: MAX/MIN read the ends of this index, then the newest day with that mood
+    CREATE INDEX IF NOT EXISTS idx_entries_mood ON wellness_entries(mood_rating, date);
+"""
 
 # Database setup (same as before but with Australian spelling)
 @st.cache_resource
 def init_database():
     """Initialise SQLite database and create table if it doesn't exist"""
     db_path = "wellness_tracker.db"
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Keep more compiled statements around than the default. The cache is keyed on
+    # the SQL text, and the save/import SQL is always the same text, so every save
+    # reuses the same prepared statement (this connection outlives reruns)
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=200)
+    conn.row_factory = sqlite3.Row  # rows can be read by column name as well as position
     cursor = conn.cursor()
+    cursor.executescript(SCHEMA_SQL)
+    cursor.executescript(STATS_SQL)
+    try:
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_date_unique
+            ON wellness_entries(date)
+        """)
+        unique_dates = True
+    except sqlite3.IntegrityError:
+        # Older databases may already hold more than one entry for a day -
+        # keep them as they are and carry on without the unique index
+        unique_dates = False
     
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS wellness_entries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE NOT NULL,
-            tracking_reason TEXT,
-            mood_rating INTEGER,
-            safety_level INTEGER,
-            energy_level INTEGER,
-            sleep_hours REAL,
-            water_intake REAL,
-            social_connection TEXT,
-            daily_win TEXT,
-            quick_mode BOOLEAN,
-            
-            -- Physical wellness
-            exercise_today TEXT,
-            movement_type TEXT,
-            sleep_quality INTEGER,
-            bowel_frequency TEXT,
-            bowel_quality TEXT,
-            digestive_sounds TEXT,
-            physical_symptoms TEXT,
-            body_tension TEXT,
-            
-            -- Emotional & trauma responses
-            stress_level INTEGER,
-            patience_level INTEGER,
-            trauma_responses TEXT,
-            triggers_today TEXT,
-            trigger_impact INTEGER,
-            coping_strategies TEXT,
-            
-            -- Connection & support
-            felt_supported TEXT,
-            safe_people_time REAL,
-            support_types TEXT,
-            relationship_conflicts TEXT,
-            
-            -- Menstrual & hormonal health
-            cycle_day INTEGER,
-            period_status TEXT,
-            hormonal_symptoms TEXT,
-            on_birth_control TEXT,
-            pill_day INTEGER,
-            started_new_pack BOOLEAN,
-            missed_pills TEXT,
-            estimated_phase TEXT,
-            period_pain INTEGER,
-            
-            -- Grounding & safety
-            body_awareness TEXT,
-            hypervigilance INTEGER,
-            grounding_techniques TEXT,
-            present_moment INTEGER,
-            
-            -- Growth & meaning
-            mindfulness_minutes INTEGER,
-            gratitude TEXT,
-            self_compassion INTEGER,
-            hope_level INTEGER,
-            
-            -- TCM indicators
-            tongue_colour TEXT,
-            tongue_coating TEXT,
-            tongue_shape TEXT,
-            qi_energy INTEGER,
-            body_temperature TEXT,
-            dampness_signs TEXT,
-            emotional_element TEXT,
-            
-            notes TEXT,
-            created_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    _migrate_list_columns_to_json(conn)
+    try:
+        _add_list_count_columns(conn)
+    except sqlite3.OperationalError:
+        # SQLite older than 3.31 has no generated columns - the app works without them
+        pass
     
     conn.commit()
-    return conn
+    
+    # Keep the query planner's statistics fresh so the date indexes keep being used
+    # (PRAGMA optimize only re-analyses tables that need it, so it's cheap)
+    conn.execute("PRAGMA optimize")
+    atexit.register(conn.execute, "PRAGMA optimize")
+    return _DB(conn, can_upsert=unique_dates and SQLITE_HAS_UPSERT)
 
-def save_to_database(conn, entry_data):
-    """Save wellness entry to database"""
-    cursor = conn.cursor()
+
+def _migrate_list_columns_to_json(conn):
+    """One-off upgrade of old str(list) values (e.g. "['Yoga']") to JSON (["Yoga"])"""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+        return
     
-    # Create a comprehensive insert statement for all fields
-    insert_sql = """
-    INSERT INTO wellness_entries (
-        date, tracking_reason, mood_rating, safety_level, energy_level,
-        sleep_hours, water_intake, social_connection, daily_win, quick_mode,
-        exercise_today, movement_type, sleep_quality, bowel_frequency, bowel_quality,
-        digestive_sounds, physical_symptoms, body_tension, stress_level, patience_level,
-        trauma_responses, triggers_today, trigger_impact, coping_strategies,
-        felt_supported, safe_people_time, support_types, relationship_conflicts,
-        cycle_day, period_status, hormonal_symptoms, on_birth_control, pill_day,
-        started_new_pack, missed_pills, estimated_phase, period_pain,
-        body_awareness, hypervigilance, grounding_techniques, present_moment,
-        mindfulness_minutes, gratitude, self_compassion, hope_level,
-        tongue_colour, tongue_coating, tongue_shape, qi_energy, body_temperature,
-        dampness_signs, emotional_element, notes
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(wellness_entries)")}
+    for column in LIST_COLUMNS:
+        if column not in existing_columns:
+            continue
+        rows = conn.execute(
+            f"SELECT id, {column} FROM wellness_entries WHERE {column} LIKE '[%' AND NOT json_valid({column})"
+        ).fetchall()
+        updates = []
+        for row_id, value in rows:
+            try:
+                updates.append((json.dumps(parse_list_cell(value)), row_id))
+            except ValueError:
+                continue  # unreadable old value - leave it as it is rather than stop the app starting
+        conn.executemany(f"UPDATE wellness_entries SET {column} = ? WHERE id = ?", updates)
+    
+    conn.execute("PRAGMA user_version = 1")
+
+# Generated "how many were picked" columns for the multi-select fields analytics count on
+LIST_COUNT_COLUMNS = {
+    'physical_symptoms': 'symptom_count',
+    'trauma_responses': 'trauma_response_count',
+    'coping_strategies': 'coping_strategy_count',
+    'hormonal_symptoms': 'hormonal_symptom_count'
+}
+
+def _add_list_count_columns(conn):
+    """One-off upgrade adding indexed count columns, e.g. for "days with 3+ trauma responses" """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= 2:
+        return
+    
+    # table_xinfo (unlike table_info) also lists generated columns
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(wellness_entries)")}
+    for column, count_column in LIST_COUNT_COLUMNS.items():
+        if column not in existing_columns or count_column in existing_columns:
+            continue
+        # SQLite can only add VIRTUAL generated columns to an existing table;
+        # the index below stores the counts, so filtering on them is still fast
+        conn.execute(f"""
+            ALTER TABLE wellness_entries ADD COLUMN {count_column} INTEGER
+            GENERATED ALWAYS AS (
+                json_array_length(CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END)
+            ) VIRTUAL
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_entries_{count_column} ON wellness_entries({count_column})")
     
-    # Extract values with Australian spellings and defaults
-    values = (
-        entry_data.get('date'),
-        entry_data.get('tracking_reason', ''),
-        entry_data.get('mood_rating', 5),
-        entry_data.get('safety_level', 5),
-        entry_data.get('energy_level', 5),
-        entry_data.get('sleep_hours', 8.0),
-        entry_data.get('water_intake', 2.5),
-        entry_data.get('social_connection', ''),
-        entry_data.get('daily_win', ''),
-        entry_data.get('quick_mode', False),
-        entry_data.get('exercise_today', ''),
-        str(entry_data.get('movement_type', [])),
-        entry_data.get('sleep_quality', 5),
-        entry_data.get('bowel_frequency', ''),
-        entry_data.get('bowel_quality', ''),
-        entry_data.get('digestive_sounds', ''),
-        str(entry_data.get('physical_symptoms', [])),
-        str(entry_data.get('body_tension', [])),
-        entry_data.get('stress_level', 5),
-        entry_data.get('patience_level', 5),
-        str(entry_data.get('trauma_responses', [])),
-        entry_data.get('triggers_today', ''),
-        entry_data.get('trigger_impact', 0),
-        str(entry_data.get('coping_strategies', [])),
-        entry_data.get('felt_supported', ''),
-        entry_data.get('safe_people_time', 0.0),
-        str(entry_data.get('support_types', [])),
-        entry_data.get('relationship_conflicts', ''),
-        entry_data.get('cycle_day', 0),
-        entry_data.get('period_status', ''),
-        str(entry_data.get('hormonal_symptoms', [])),
-        entry_data.get('on_birth_control', ''),
-        entry_data.get('pill_day', 0),
-        entry_data.get('started_new_pack', False),
-        entry_data.get('missed_pills', ''),
-        entry_data.get('estimated_phase', ''),
-        entry_data.get('period_pain', 0),
-        entry_data.get('body_awareness', ''),
-        entry_data.get('hypervigilance', 5),
-        str(entry_data.get('grounding_techniques', [])),
-        entry_data.get('present_moment', 5),
-        entry_data.get('mindfulness_minutes', 0),
-        entry_data.get('gratitude', ''),
-        entry_data.get('self_compassion', 5),
-        entry_data.get('hope_level', 5),
-        entry_data.get('tongue_colour', ''),
-        entry_data.get('tongue_coating', ''),
-        str(entry_data.get('tongue_shape', [])),
-        entry_data.get('qi_energy', 5),
-        entry_data.get('body_temperature', ''),
-        str(entry_data.get('dampness_signs', [])),
-        entry_data.get('emotional_element', ''),
-        entry_data.get('notes', '')
+    conn.execute("PRAGMA user_version = 2")
+
+# Every saved field, in the order used by the INSERT statements
+ENTRY_COLUMNS = (
+    'date', 'tracking_reason', 'mood_rating', 'safety_level', 'energy_level',
+    'sleep_hours', 'water_intake', 'social_connection', 'daily_win', 'quick_mode',
+    'exercise_today', 'movement_type', 'sleep_quality', 'bowel_frequency', 'bowel_quality',
+    'digestive_sounds', 'physical_symptoms', 'body_tension', 'stress_level', 'patience_level',
+    'trauma_responses', 'triggers_today', 'trigger_impact', 'coping_strategies',
+    'felt_supported', 'safe_people_time', 'support_types', 'relationship_conflicts',
+    'cycle_day', 'period_status', 'hormonal_symptoms', 'on_birth_control', 'pill_day',
+    'started_new_pack', 'missed_pills', 'estimated_phase', 'period_pain',
+    'body_awareness', 'hypervigilance', 'grounding_techniques', 'present_moment',
+    'mindfulness_minutes', 'gratitude', 'self_compassion', 'hope_level',
+    'tongue_colour', 'tongue_coating', 'tongue_shape', 'qi_energy', 'body_temperature',
+    'dampness_signs', 'emotional_element', 'notes'
+)
+
+# Insert statement for all fields (shared by the single and batch save paths)
+INSERT_ENTRY_SQL = f"""
+INSERT INTO wellness_entries ({', '.join(ENTRY_COLUMNS)})
+VALUES ({', '.join('?' * len(ENTRY_COLUMNS))})
+"""
+
+# Same insert, but saving a day that already has an entry updates it instead
+# (one statement instead of "check if it exists, then insert")
+UPSERT_MANY_SQL = INSERT_ENTRY_SQL + f"""
+ON CONFLICT(date) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in ENTRY_COLUMNS if column != 'date')}
+"""
+# Single saves also want the id back (executemany can't return rows)
+UPSERT_ENTRY_SQL = UPSERT_MANY_SQL + "RETURNING id\n"
+
+# Value used when an entry doesn't include a field (e.g. quick check-ins)
+ENTRY_DEFAULTS = {
+    'date': None, 'tracking_reason': '', 'mood_rating': 5, 'safety_level': 5, 'energy_level': 5,
+    'sleep_hours': 8.0, 'water_intake': 2.5, 'social_connection': '', 'daily_win': '', 'quick_mode': False,
+    'exercise_today': '', 'movement_type': [], 'sleep_quality': 5, 'bowel_frequency': '', 'bowel_quality': '',
+    'digestive_sounds': '', 'physical_symptoms': [], 'body_tension': [], 'stress_level': 5, 'patience_level': 5,
+    'trauma_responses': [], 'triggers_today': '', 'trigger_impact': 0, 'coping_strategies': [],
+    'felt_supported': '', 'safe_people_time': 0.0, 'support_types': [], 'relationship_conflicts': '',
+    'cycle_day': 0, 'period_status': '', 'hormonal_symptoms': [], 'on_birth_control': '', 'pill_day': 0,
+    'started_new_pack': False, 'missed_pills': '', 'estimated_phase': '', 'period_pain': 0,
+    'body_awareness': '', 'hypervigilance': 5, 'grounding_techniques': [], 'present_moment': 5,
+    'mindfulness_minutes': 0, 'gratitude': '', 'self_compassion': 5, 'hope_level': 5,
+    'tongue_colour': '', 'tongue_coating': '', 'tongue_shape': [], 'qi_energy': 5, 'body_temperature': '',
+    'dampness_signs': [], 'emotional_element': '', 'notes': ''
+}
+
+def _coerce(value):
+    """Turn a field value into something SQLite can store (lists and sets become JSON)"""
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value))
+    if isinstance(value, frozenset):
+        return json.dumps(sorted(value))  # sorted so the same picks always save the same way
+    return value
+
+def _row_tuple(entry_data):
+    """Build the INSERT values for one entry, in ENTRY_COLUMNS order with defaults"""
+    return tuple(_coerce(entry_data.get(column, ENTRY_DEFAULTS[column])) for column in ENTRY_COLUMNS)
+
+def save_to_database(db, entry_data):
+    """Save wellness entry to database (replaces any entry already saved for that date)"""
+    if not isinstance(entry_data, dict):
+        # A list of entries goes in as one batch
+        return save_many_to_database(db, entry_data)
+    values = _row_tuple(entry_data)
+    with db.lock, db.conn:
+        if not db.can_upsert:
+            # Older database with duplicate dates (or a very old SQLite) - just add the entry
+            return db.conn.execute(INSERT_ENTRY_SQL, values).lastrowid
+        if SQLITE_HAS_RETURNING:
+            return db.conn.execute(UPSERT_ENTRY_SQL, values).fetchone()[0]
+        # No RETURNING - look the id up by date instead (lastrowid isn't set when a day is updated)
+        db.conn.execute(UPSERT_MANY_SQL, values)
+        return db.conn.execute(
+            "SELECT id FROM wellness_entries WHERE date = ?", (values[0],)
+        ).fetchone()[0]
+
+# Bulk imports keep the entry already saved for a day and skip the imported one
+IMPORT_ENTRY_SQL = INSERT_ENTRY_SQL + "ON CONFLICT(date) DO NOTHING"
+
+def bulk_import(db, entries):
+    """Import many entries in one transaction, building the date index once at the end"""
+    values = [_row_tuple(entry) for entry in entries]
+    conn = db.conn
+    with db.lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Keeping an index up to date row by row is slower than rebuilding it afterwards
+            conn.execute("DROP INDEX IF EXISTS idx_entries_date_created")
+            # No unique index on date (older database) - import every row
+            cursor = conn.executemany(IMPORT_ENTRY_SQL if db.can_upsert else INSERT_ENTRY_SQL, values)
+            conn.execute(DATE_CREATED_INDEX_SQL)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return cursor.rowcount
+
+def save_many_to_database(db, entries):
+    """Save several wellness entries at once (one executemany, one commit)"""
+    values = [_row_tuple(entry) for entry in entries]
+    # No unique index on date (older database) - just add the entries
+    sql = UPSERT_MANY_SQL if db.can_upsert else INSERT_ENTRY_SQL
+    with db.lock, db.conn:
+        return db.conn.executemany(sql, values).rowcount
+
+# Narrow column sets for the views that don't need every field
+CALENDAR_COLUMNS = ('date', 'mood_rating', 'energy_level', 'safety_level', 'sleep_hours', 'daily_win')
+ANALYTICS_COLUMNS = (
+    'date', 'mood_rating', 'safety_level', 'energy_level', 'sleep_hours', 'water_intake',
+    'sleep_quality', 'stress_level', 'patience_level',
+    'cycle_day', 'period_status', 'hormonal_symptom_count', 'estimated_phase'
+)
+# Smaller float type for measurements that only need one decimal place
+VIEW_DTYPES = {'sleep_hours': 'float32', 'water_intake': 'float32'}
+# 0-10 ratings and cycle/pill days all fit in a single byte
+# (mindfulness_minutes isn't here - it can go past 127)
+SMALL_INT_COLUMNS = frozenset((
+    'mood_rating', 'safety_level', 'energy_level', 'sleep_quality',
+    'stress_level', 'patience_level', 'trigger_impact', 'hypervigilance',
+    'present_moment', 'self_compassion', 'hope_level', 'qi_energy',
+    'period_pain', 'cycle_day', 'pill_day', 'hormonal_symptom_count'
+))
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_cached(version_token, columns, _conn, date_range=None, limit=None):
+    """Run the ordered SELECT and return NumPy-typed columns (date is datetime64)
+
+    Charts should be given column.to_numpy() rather than .tolist() so Plotly
+    can use the arrays directly. Cached per version token and column list
+    (_conn isn't hashed). date_range is an optional (start, end) pair of ISO
+    dates - start included, end not - so SQLite does the filtering. limit
+    keeps just that many of the newest rows.
+    """
+    where = "WHERE date >= ? AND date < ?" if date_range else ""
+    query = f"""
+        SELECT {', '.join(columns)} FROM wellness_entries {where}
+        ORDER BY date DESC, created_timestamp DESC
+        {"LIMIT ?" if limit else ""}
+    """
+    # We already know the table, so build the DataFrame straight from the rows
+    # (skips the type guessing pd.read_sql_query does first)
+    cursor = _conn.execute(query, (*(date_range or ()), *((limit,) if limit else ())))
+    df = pd.DataFrame.from_records(
+        cursor.fetchall(), columns=[description[0] for description in cursor.description]
     )
+    df['date'] = pd.to_datetime(df['date'])
+    # Date parts the tabs need, worked out once per load instead of in every filter
+    df['day_of_month'] = df['date'].dt.day.astype('int8')
+    df['date_display'] = df['date'].dt.strftime('%d/%m/%Y')  # Australian format for tables and hovers
     
-    cursor.execute(insert_sql, values)
-    conn.commit()
-    return cursor.lastrowid
+    # Convert all number columns in one astype call (assigning them one at a
+    # time fragments the DataFrame). Rating columns with blanks become float32
+    # so the blanks stay as NaN, which Plotly can still draw.
+    column_types = {column: kind for column, kind in VIEW_DTYPES.items() if column in df.columns}
+    column_types.update({
+        column: 'int8' if df[column].notna().all() else 'float32'
+        for column in df.columns if column in SMALL_INT_COLUMNS
+    })
+    return df.astype(column_types) if column_types else df
+
+def _table_version(conn):
+    """Cheap fingerprint of the table, used as the cache key for loaded data"""
+    # New rows change the count (kept by the wellness_stats triggers, so no
+    # counting) and latest date (answered from the date index),
+    # total_changes catches edits made through this connection and
+    # data_version catches edits made by anything else (e.g. the setup script)
+    row_count, latest_date = conn.execute(
+        "SELECT entry_count, COALESCE((SELECT MAX(date) FROM wellness_entries), '') FROM wellness_stats"
+    ).fetchone()
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    return (row_count, latest_date, data_version, conn.total_changes)
 
 def load_from_database(conn):
-    """Load all wellness entries from database"""
-    query = """
-        SELECT * FROM wellness_entries 
+    """Load all wellness entries from database (re-queried only when the data changes)"""
+    return _load_cached(_table_version(conn), ('*',), conn)
+
+def _existing_columns(conn, columns):
+    """Keep only the columns this database has (older databases lack some)"""
+    # table_xinfo also lists the generated count columns
+    existing_columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(wellness_entries)")}
+    return tuple(column for column in columns if column in existing_columns)
+
+def load_analytics_view(conn, columns=ANALYTICS_COLUMNS):
+    """Load only the given columns (those missing from older databases are skipped)"""
+    return _load_cached(_table_version(conn), _existing_columns(conn, columns), conn)
+
+def load_calendar_view(conn):
+    """Load just the columns the Calendar tab and sidebar use"""
+    return load_analytics_view(conn, CALENDAR_COLUMNS)
+
+def load_month(conn, year, month):
+    """Load the Calendar tab's columns for one month only"""
+    start = datetime.date(year, month, 1)
+    end = datetime.date(year + month // 12, month % 12 + 1, 1)  # first day of next month
+    return _load_cached(
+        _table_version(conn), _existing_columns(conn, CALENDAR_COLUMNS), conn,
+        (start.isoformat(), end.isoformat())
+    )
+
+def load_recent(conn, n=7):
+    """The n newest entries, oldest first (read from the newest-first date index)"""
+    recent_data = _load_cached(
+        _table_version(conn), ('date', 'mood_rating', 'energy_level', 'safety_level'), conn, limit=n
+    )
+    return recent_data.iloc[::-1]
+
+def load_year_range(conn):
+    """Years from the first to the last entry (empty if there are no entries yet)"""
+    first_date, last_date = conn.execute(
+        "SELECT MIN(date), MAX(date) FROM wellness_entries"
+    ).fetchone()
+    if first_date is None:
+        return []
+    return list(range(int(first_date[:4]), int(last_date[:4]) + 1))
+
+@st.cache_data(ttl=3600)
+def _streak_day(version_token, today, _conn):
+    """Count back through the daily entries to find which day of the streak today is"""
+    streak_day = 1  # today always counts
+    expected = today - datetime.timedelta(days=1)
+    # Newest first, so we can stop at the first missed day
+    # (DISTINCT: older databases can have more than one entry for a day)
+    for (entry_date,) in _conn.execute(
+        "SELECT DISTINCT date FROM wellness_entries WHERE date < ? ORDER BY date DESC", (today.isoformat(),)
+    ):
+        if entry_date != expected.isoformat():
+            break
+        streak_day += 1
+        expected -= datetime.timedelta(days=1)
+    return streak_day
+
+def get_streak_day(conn):
+    """Day number of the current check-in streak (1 = starting fresh today)"""
+    return _streak_day(_table_version(conn), datetime.date.today(), conn)
+
+# The sidebar shows on every rerun, so work its numbers out once per data change
+@st.cache_data(ttl=300, show_spinner=False)
+def _sidebar_stats(version_token, today, _conn):
+    """Numbers for the sidebar's Quick Stats (None if there are no entries yet)"""
+    return sidebar_stats(_conn, today)
+
+def get_sidebar_stats(conn):
+    """Quick Stats for the sidebar (re-worked out only when the data changes)"""
+    return _sidebar_stats(_table_version(conn), datetime.date.today(), conn)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def database_size_kb():
+    """Size of the database (main file plus -wal file) in KB (None if it hasn't been created yet)"""
+    size = database_size_bytes("wellness_tracker.db")
+    return None if size is None else size / 1024
+
+# Analytics results that only change when the data does - cached with the same
+# table fingerprint as the loaders (_df isn't hashed)
+@st.cache_data(ttl=600, show_spinner=False)
+def _correlation_summary(version_token, columns, _df):
+    """Correlation matrix plus the strongest pair of different metrics (or None)"""
+    corr_data = _df[list(columns)].corr()
+    strongest_corr = corr_data.abs().unstack().sort_values(ascending=False)
+    # Remove self-correlations
+    strongest_corr = strongest_corr[strongest_corr < 1.0]
+    if len(strongest_corr) == 0:
+        return corr_data, None
+    return corr_data, (strongest_corr.index[0], strongest_corr.iloc[0])
+
+def _trendline_points(x_values, y_values, trendline):
+    """Points along a trendline: 'ols' is a straight line, 'lowess' a smoothed curve"""
+    if len(x_values) < 2:
+        return None
+    if trendline == 'ols':
+        # A straight line only needs its two end points
+        slope, intercept = np.polyfit(x_values, y_values, 1)
+        line_x = np.array([x_values.min(), x_values.max()])
+        return line_x, slope * line_x + intercept
+    from statsmodels.nonparametric.smoothers_lowess import lowess  # only needed for curves
+    fitted = lowess(y_values, x_values)  # comes back sorted by x
+    return fitted[:, 0], fitted[:, 1]
+
+# cache_data hands each caller its own copy, so changing the layout of one
+# chart can't leak into the next rerun or another user's session
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _trendline_figure(version_token, x, y, title, labels, trendline, _df):
+    """Scatter chart with a fitted trendline (fitting is the slow part, so keep the figure)"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    fig = px.scatter(_df, x=x, y=y, title=title, labels=labels)
+    points = _df[[x, y]].dropna()
+    line = _trendline_points(points[x].to_numpy(dtype=float), points[y].to_numpy(dtype=float), trendline)
+    if line is not None:
+        fig.add_trace(go.Scatter(x=line[0], y=line[1], mode='lines', name='Trend', showlegend=False))
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _export_csv(version_token, date_range, _conn):
+    """CSV file contents for every entry, or just those in an (first, last) ISO date range"""
+    where = "WHERE date BETWEEN ? AND ?" if date_range else ""
+    cursor = _conn.execute(f"""
+        SELECT * FROM wellness_entries {where}
         ORDER BY date DESC, created_timestamp DESC
-    """
-    return pd.read_sql_query(query, conn)
+    """, date_range or ())
+    # Rows go straight from SQLite into the CSV - no DataFrame in between
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(description[0] for description in cursor.description)
+    writer.writerows(cursor)
+    return buffer.getvalue().encode("utf-8")
+
+def export_csv(conn, date_range=None):
+    """CSV export of the entries (re-built only when the data or date range changes)"""
+    if date_range:
+        date_range = (date_range[0].isoformat(), date_range[1].isoformat())
+    return _export_csv(_table_version(conn), date_range, conn)
 
 def check_existing_entry(conn, date):
-    """Check if entry already exists for given date"""
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM wellness_entries WHERE date = ?", (date,))
-    return cursor.fetchone() is not None
+    """Check if entry already exists for given date (for messages only - saving handles it)"""
+    return conn.execute(
+        "SELECT 1 FROM wellness_entries WHERE date = ? LIMIT 1", (date,)
+    ).fetchone() is not None
 
 # Initialise database connection
-conn = init_database()
+db = init_database()
+conn = db.conn  # reads use the connection directly; writes go through db
 
 # Welcome section - trauma-informed language
 st.title("🌱 Your Complete Wellness Journey")
-st.markdown("""
-<div class="section-header">
-    <h3>🌟 Daily Tracking + Visual Insights</h3>
-    <p>Track your wellness patterns, view beautiful calendar insights, and understand your unique health journey</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(WELCOME_HEADER_HTML, unsafe_allow_html=True)
 
 # Create main navigation tabs
 tab1, tab2, tab3 = st.tabs(["📝 Daily Check-In", "🗓️ Calendar View", "📊 Analytics"])
@@ -282,739 +956,541 @@ tab1, tab2, tab3 = st.tabs(["📝 Daily Check-In", "🗓️ Calendar View", "
 # TAB 1: DAILY CHECK-IN (Complete Version)
 # ===============================
 
-with tab1:
-    st.markdown("""
-    <div class="section-header">
-        <h3>📝 Your Daily Wellness Check-In</h3>
-        <p>This is your safe space to track your wellness journey. Go at your own pace, 
-        and remember - there are no right or wrong answers, only your truth.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    with st.form("daily_wellness_form"):
-        # Main tracking reason - personalises the entire experience
-        tracking_reason = st.selectbox(
-            "🎯 What's your main reason for tracking wellness?",
-            [
-                "Select your primary focus...",
-                "🌸 Hormonal changes (PMS, menopause, cycles)",
-                "🧠 Trauma recovery & PTSD healing", 
-                "😔 Depression & mood support",
-                "😰 Anxiety & stress management",
-                "⚡ ADHD & neurodivergence support",
-                "🩺 Chronic illness management",
-                "💊 Medication monitoring",
-                "🌱 General wellness & self-care",
-                "🔄 Life transitions & major changes"
-            ],
-            help="This helps personalise your tracking experience"
+# The check-in is split into fragments: moving a slider in one of the optional
+# sections only reruns that section, and the essentials only rerun the
+# check-in (not the calendar, analytics and sidebar).
+# Each section keeps its latest answers in st.session_state.checkin so the save
+# button can gather them all without redrawing every widget.
+# Multi-select picks are kept there as frozensets, so checking whether
+# something was picked doesn't mean searching a list.
+
+# Which sections open by default - only worked out again when one of the
+# answers it depends on changes
+@st.cache_data(max_entries=256)
+def _visibility_flags(tracking_reason, mood, safety, energy, social, gender):
+    """Decide which check-in sections should open by default"""
+    tags = reason_tags(tracking_reason)
+    return {
+        # Safety & Grounding (Show for trauma, anxiety, or low safety scores)
+        'safety': safety <= 5 or "trauma" in tags or "anxiety" in tags,
+        # Physical Wellness (Show for chronic illness, ADHD, hormonal, or low energy)
+        'physical': (
+            energy <= 4 or
+            "chronic illness" in tags or
+            "adhd" in tags or
+            "hormonal" in tags
+        ),
+        # Emotional & Trauma Responses (Show for depression, trauma, anxiety, or low mood)
+        'emotional': (
+            mood <= 4 or
+            "depression" in tags or
+            "trauma" in tags or
+            "anxiety" in tags
+        ),
+        # Connection & Support (expand if isolated or for depression/trauma)
+        'connection': (
+            "isolated" in social.lower() or
+            "depression" in tags or
+            "trauma" in tags
+        ),
+        # Menstrual & Hormonal Health (based on gender or tracking reason)
+        'menstrual': (
+            "hormonal" in tags or
+            gender in ["Female", "Transgender female", "Non-binary"]
         )
+    }
 
-        # Optional demographic info for relevant sections
-        with st.expander("👤 Optional: Demographics (helps personalise your experience)"):
-            gender = st.selectbox(
-                "Gender (optional - helps show relevant health sections):",
-                [
-                    "Prefer not to say",
-                    "Female", 
-                    "Male",
-                    "Non-binary",
-                    "Transgender female",
-                    "Transgender male",
-                    "Other"
-                ],
-                help="Used only to show relevant health tracking sections (like menstrual cycle)"
-            )
+# Not a fragment: the essentials decide which sections below open, so changing
+# one of them has to rerun the whole check-in (a widget in a fragment only
+# reruns that fragment)
+def _render_essentials():
+    """Draw the daily essentials and share their answers"""
+    # Divider and section card go out as one element
+    st.markdown(ESSENTIALS_CARD_HTML, unsafe_allow_html=True)
+
+    # The Big 3 - most predictive of wellbeing
+    col1, col2, col3 = st.columns(3, gap="small")
 
-        # Date - Australian format DD/MM/YYYY
-        selected_date = st.date_input(
-            "📅 Today's date:", 
-            datetime.date.today(),
-            format="DD/MM/YYYY",
-            help="Australian date format: day/month/year"
+    with col1:
+        mood_rating = st.slider(
+            "Overall Mood Today",
+            min_value=1, max_value=10, value=5, step=1,
+            help="Your emotional state - the foundation metric"
         )
 
-        # Progress tracking motivation with personalised messaging
-        if tracking_reason != "Select your primary focus...":
-            reason_display = tracking_reason.split(" ", 1)[1]  # Remove emoji for cleaner display
-            st.markdown(f"""
-            <div class="habit-streak">
-                <h3>🔥 Day 1 of Your {reason_display.title()} Journey</h3>
-                <p><strong>You're taking charge of your {reason_display.lower()} - that's incredibly brave!</strong></p>
-                <p>Daily consistency is the key to understanding your patterns and healing</p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown("""
-            <div class="habit-streak">
-                <h3>🔥 Your Daily Wellness Journey</h3>
-                <p><strong>You showed up today - that's what matters most!</strong></p>
-                <p>Daily consistency beats perfection every time</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Progress tracking
-        quick_mode = st.checkbox("⚡ Quick Mode (5 minutes)", value=False, help="Just the essentials when you're short on time")
-        
-        if quick_mode:
-            st.info("👍 Perfect! Consistency matters more than completeness. Let's do the essentials!")
-        else:
-            st.success("🌟 Full check-in mode - you're investing in your healing today!")
+    with col2:
+        safety_level = st.slider(
+            "Safety in Your Body",
+            min_value=1, max_value=10, value=5, step=1,
+            help="Core trauma recovery metric - how safe you felt"
+        )
 
-        st.markdown("---")
+    with col3:
+        energy_level = st.slider(
+            "Physical Energy",
+            min_value=1, max_value=10, value=5, step=1,
+            help="Your body's energy and vitality"
+        )
 
-        # ===============================
-        # CORE ESSENTIALS (Always visible)
-        # ===============================
+    # Essential daily habits
+    habits_col1, habits_col2 = st.columns(2, gap="small")
+
+    with habits_col1:
+        sleep_hours = st.number_input(
+            "Sleep Hours Last Night:",
+            min_value=0.0, max_value=24.0, value=8.0, step=0.5,
+            help="Quality sleep is crucial for trauma recovery"
+        )
 
-        st.markdown("""
-        <div class="section-card">
-            <h3>🎯 Daily Essentials (Required - 2 minutes)</h3>
-            <p>These 6 questions are the foundation of your healing. Never skip these!</p>
-        </div>
-        """, unsafe_allow_html=True)
+        water_intake = st.number_input(
+            "Water Intake (litres):",
+            min_value=0.0, max_value=6.0, value=2.5, step=0.25,
+            help="Aim for 2-3L daily - hydration affects nervous system regulation"
+        )
 
-        # The Big 3 - most predictive of wellbeing
-        col1, col2, col3 = st.columns(3)
+    with habits_col2:
+        social_connection = st.selectbox(
+            "Social Connection Quality Today:",
+            SOCIAL_CONNECTION_OPTIONS,
+            help="Relationships are medicine for trauma survivors"
+        )
 
-        with col1:
-            mood_rating = st.slider(
-                "Overall Mood Today",
-                min_value=1, max_value=10, value=5, step=1,
-                help="Your emotional state - the foundation metric"
+        # Quick win celebration
+        daily_win = st.text_input(
+            "One thing you accomplished today:",
+            placeholder="Made brekkie, had a shower, sent a text, got out of bed...",
+            help="In healing, EVERYTHING counts as an accomplishment!"
+        )
+
+    # Immediate feedback on essentials, all drawn into one placeholder slot
+    feedback_slot = st.empty()
+    with feedback_slot.container():
+        if mood_rating >= 7 and safety_level >= 7:
+            st.success("🌟 Excellent! Your core metrics look strong today!")
+        elif mood_rating <= 3 or safety_level <= 3:
+            st.info("💙 Thank you for being honest. Difficult days are part of the healing journey.")
+
+        if daily_win:
+            st.success(f"🎉 Celebrating: {daily_win} - You showed up for yourself today!")
+
+    st.markdown("---")
+
+    st.session_state.checkin['essentials'] = {
+        'mood_rating': mood_rating,
+        'safety_level': safety_level,
+        'energy_level': energy_level,
+        'sleep_hours': sleep_hours,
+        'water_intake': water_intake,
+        'social_connection': social_connection,
+        'daily_win': daily_win
+    }
+
+@st.fragment
+def _render_safety_section(expanded):
+    """Draw the Safety & Grounding section and share its answers"""
+    with st.expander("🛡️ Safety & Grounding", expanded=expanded):
+        st.markdown(SAFETY_CARD_HTML, unsafe_allow_html=True)
+
+        body_awareness = st.selectbox(
+            "Connection to your body today:",
+            BODY_AWARENESS_OPTIONS
+        )
+
+        hypervigilance = st.slider(
+            "Scanning for threats/danger:",
+            min_value=1, max_value=10, value=5, step=1,
+            help="1 = Relaxed, 10 = Constantly on alert"
+        )
+
+        grounding_techniques = st.multiselect(
+            "Grounding techniques used:",
+            GROUNDING_TECHNIQUES
+        )
+
+        present_moment = st.slider(
+            "How present/grounded:",
+            min_value=1, max_value=10, value=5, step=1
+        )
+
+    st.session_state.checkin['safety'] = {
+        'body_awareness': body_awareness,
+        'hypervigilance': hypervigilance,
+        'grounding_techniques': frozenset(grounding_techniques),
+        'present_moment': present_moment
+    }
+
+@st.fragment
+def _render_physical_section(expanded):
+    """Draw the Physical Wellness section and share its answers"""
+    with st.expander("💪 Physical Wellness", expanded=expanded):
+        st.markdown(PHYSICAL_CARD_HTML, unsafe_allow_html=True)
+
+        physical_col1, physical_col2 = st.columns(2, gap="small")
+
+        with physical_col1:
+            exercise_today = st.radio(
+                "Movement today:",
+                EXERCISE_OPTIONS,
+                help="Any movement counts!",
+                key="exercise_today"
             )
 
-        with col2:
-            safety_level = st.slider(
-                "Safety in Your Body",
-                min_value=1, max_value=10, value=5, step=1,
-                help="Core trauma recovery metric - how safe you felt"
+            movement_type = []
+            # Follow-up widgets are only created when their parent answer needs them
+            if st.session_state.exercise_today != "No":
+                movement_type = st.multiselect(
+                    "Types of movement:",
+                    MOVEMENT_TYPES,
+                    key="movement_type"
+                )
+
+            sleep_quality = st.slider(
+                "Sleep quality (1-10):",
+                min_value=1, max_value=10, value=5, step=1
             )
 
-        with col3:
-            energy_level = st.slider(
-                "Physical Energy",
-                min_value=1, max_value=10, value=5, step=1,
-                help="Your body's energy and vitality"
+            # Bowel movement tracking (important for all conditions)
+            bowel_frequency = st.selectbox(
+                "Bowel movements today:",
+                BOWEL_FREQUENCY_OPTIONS,
+                help="Digestive health reflects overall wellness and affects mood/energy"
             )
 
-        # Essential daily habits
-        habits_col1, habits_col2 = st.columns(2)
+            bowel_quality = st.selectbox(
+                "Stool consistency (Bristol Scale):",
+                list(BristolType),
+                format_func=BRISTOL_LABELS.get,
+                help="Bristol Stool Chart is used medically to assess digestive health"
+            )
 
-        with habits_col1:
-            sleep_hours = st.number_input(
-                "Sleep Hours Last Night:",
-                min_value=0.0, max_value=24.0, value=8.0, step=0.5,
-                help="Quality sleep is crucial for trauma recovery"
+        with physical_col2:
+            # Digestive sounds (often overlooked but important)
+            digestive_sounds = st.selectbox(
+                "Digestive sounds/rumbling today:",
+                DIGESTIVE_SOUNDS_OPTIONS,
+                help="Gut sounds reflect digestion, stress levels, and nervous system activity"
             )
-            
-            water_intake = st.number_input(
-                "Water Intake (litres):",
-                min_value=0.0, max_value=6.0, value=2.5, step=0.25,
-                help="Aim for 2-3L daily - hydration affects nervous system regulation"
+
+            physical_symptoms = st.multiselect(
+                "Physical symptoms noticed:",
+                PHYSICAL_SYMPTOMS
             )
 
-        with habits_col2:
-            social_connection = st.selectbox(
-                "Social Connection Quality Today:",
-                [
-                    "Select an option...",
-                    "Deep, meaningful connections",
-                    "Good interactions - felt heard",
-                    "Surface-level interactions only",
-                    "Minimal social contact",
-                    "Completely isolated"
-                ],
-                help="Relationships are medicine for trauma survivors"
+            body_tension = st.multiselect(
+                "Where did you feel tension:",
+                BODY_TENSION_AREAS
             )
-            
-            # Quick win celebration
-            daily_win = st.text_input(
-                "One thing you accomplished today:",
-                placeholder="Made brekkie, had a shower, sent a text, got out of bed...",
-                help="In healing, EVERYTHING counts as an accomplishment!"
+
+    st.session_state.checkin['physical'] = {
+        'exercise_today': exercise_today,
+        'movement_type': frozenset(movement_type),
+        'sleep_quality': sleep_quality,
+        'bowel_frequency': bowel_frequency,
+        'bowel_quality': BRISTOL_LABELS[bowel_quality],  # saved as the label
+        'digestive_sounds': digestive_sounds,
+        'physical_symptoms': frozenset(physical_symptoms),
+        'body_tension': frozenset(body_tension)
+    }
+
+@st.fragment
+def _render_emotional_section(expanded):
+    """Draw the Emotional & Trauma Responses section and share its answers"""
+    with st.expander("💙 Emotional & Trauma Responses", expanded=expanded):
+        st.markdown(EMOTIONAL_CARD_HTML, unsafe_allow_html=True)
+
+        emotional_col1, emotional_col2 = st.columns(2, gap="small")
+
+        with emotional_col1:
+            stress_level = st.slider(
+                "Stress level:",
+                min_value=1, max_value=10, value=5, step=1
             )
 
-        # Immediate feedback on essentials
-        if mood_rating >= 7 and safety_level >= 7:
-            st.success("🌟 Excellent! Your core metrics look strong today!")
-        elif mood_rating <= 3 or safety_level <= 3:
-            st.info("💙 Thank you for being honest. Difficult days are part of the healing journey.")
+            patience_level = st.slider(
+                "How patient were you today (with yourself and others)?",
+                min_value=1, max_value=10, value=5, step=1,
+                help="1 = Very impatient/irritable, 10 = Very patient and understanding"
+            )
 
-        if daily_win:
-            st.success(f"🎉 Celebrating: {daily_win} - You showed up for yourself today!")
+            trauma_responses = st.multiselect(
+                "Trauma responses noticed:",
+                TRAUMA_RESPONSES
+            )
 
-        st.markdown("---")
+        with emotional_col2:
+            triggers_today = st.radio(
+                "Emotional triggers encountered:",
+                TRIGGER_OPTIONS,
+                key="triggers_today"
+            )
 
-        # ===============================
-        # CONDITIONAL SECTIONS (Based on mode/responses)
-        # ===============================
+            trigger_impact = 0
+            if st.session_state.triggers_today == "Yes":
+                trigger_impact = st.slider(
+                    "How much did triggers affect you:",
+                    min_value=1, max_value=10, step=1,
+                    key="trigger_impact"
+                )
 
-        if not quick_mode:
-            # Safety & Grounding (Show for trauma, anxiety, or low safety scores)
-            show_safety = (
-                safety_level <= 5 or 
-                "trauma" in tracking_reason.lower() or 
-                "anxiety" in tracking_reason.lower()
+            coping_strategies = st.multiselect(
+                "Healthy coping used:",
+                COPING_STRATEGIES
             )
-            
-            # Always show as expandable section, auto-expand if conditions met
-            with st.expander("🛡️ Safety & Grounding", expanded=show_safety):
-                st.markdown("""
-                <div class="section-card">
-                    <h3>🛡️ Safety & Grounding</h3>
-                    <p>Your nervous system needs extra attention today</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                grounding_col1, grounding_col2 = st.columns(2)
-                
-                with grounding_col1:
-                    body_awareness = st.selectbox(
-                        "Connection to your body today:",
-                        [
-                            "Select...",
-                            "Felt connected and aware",
-                            "Somewhat connected",
-                            "Disconnected or numb",
-                            "Very dissociated"
-                        ]
-                    )
-                    
-                    hypervigilance = st.slider(
-                        "Scanning for threats/danger:",
-                        min_value=1, max_value=10, value=5, step=1,
-                        help="1 = Relaxed, 10 = Constantly on alert"
-                    )
-                
-                with grounding_col2:
-                    grounding_techniques = st.multiselect(
-                        "Grounding techniques used:",
-                        [
-                            "5-4-3-2-1 sensory technique",
-                            "Deep breathing/box breathing", 
-                            "Cold water on face/hands",
-                            "Progressive muscle relaxation",
-                            "Mindful movement/stretching", 
-                            "Time in nature",
-                            "Hold ice cube/cold object",
-                            "Stomp feet/feel ground connection",
-                            "Count backwards from 100 by 7s",
-                            "Name items in categories",
-                            "Self-talk (name, place, date)",
-                            "Touch different textures",
-                            "Essential oils/calming scents",
-                            "Warm then cold water on hands",
-                            "Mindful eating (mint, lemon)",
-                            "Physical movement/exercise",
-                            "Grounding phrases/affirmations",
-                            "None today"
-                        ]
-                    )
-                    
-                    present_moment = st.slider(
-                        "How present/grounded:",
-                        min_value=1, max_value=10, value=5, step=1
-                    )
-            
-            # Physical Wellness (Show for chronic illness, ADHD, hormonal, or low energy)
-            show_physical = (
-                energy_level <= 4 or
-                "chronic illness" in tracking_reason.lower() or
-                "adhd" in tracking_reason.lower() or
-                "hormonal" in tracking_reason.lower()
+
+    st.session_state.checkin['emotional'] = {
+        'stress_level': stress_level,
+        'patience_level': patience_level,
+        'trauma_responses': frozenset(trauma_responses),
+        'triggers_today': triggers_today,
+        'trigger_impact': trigger_impact,
+        'coping_strategies': frozenset(coping_strategies)
+    }
+
+@st.fragment
+def _render_connection_section(expanded):
+    """Draw the Connection & Support section and share its answers"""
+    with st.expander("🤗 Connection & Support", expanded=expanded):
+        st.markdown(CONNECTION_CARD_HTML, unsafe_allow_html=True)
+
+        felt_supported = st.radio(
+            "Felt supported today:",
+            FELT_SUPPORTED_OPTIONS
+        )
+
+        safe_people_time = st.number_input(
+            "Time with safe people (hours):",
+            min_value=0.0, max_value=24.0, value=0.0, step=0.25,
+            help="Includes family, friends, therapists, support groups, pets"
+        )
+
+        support_types = st.multiselect(
+            "Support received:",
+            SUPPORT_TYPES
+        )
+
+        relationship_conflicts = st.selectbox(
+            "Relationship conflicts:",
+            RELATIONSHIP_CONFLICT_OPTIONS
+        )
+
+    st.session_state.checkin['connection'] = {
+        'felt_supported': felt_supported,
+        'safe_people_time': safe_people_time,
+        'support_types': frozenset(support_types),
+        'relationship_conflicts': relationship_conflicts
+    }
+
+@st.fragment
+def _render_menstrual_section(expanded):
+    """Draw the Menstrual Cycle Tracking section and share its answers"""
+    with st.expander("🌸 Menstrual Cycle Tracking", expanded=expanded):
+        st.markdown(MENSTRUAL_CARD_HTML, unsafe_allow_html=True)
+
+        menstrual_col1, menstrual_col2 = st.columns(2, gap="small")
+
+        with menstrual_col1:
+            # Basic cycle tracking
+            cycle_day = st.number_input(
+                "What day of your cycle? (Day 1 = first day of period):",
+                min_value=1, max_value=50, value=1, step=1,
+                help="Day 1 = first day of menstrual bleeding. Average cycle is 28 days."
             )
-            
-            # Always show as expandable section, auto-expand if conditions met
-            with st.expander("💪 Physical Wellness", expanded=show_physical):
-                st.markdown("""
-                <div class="section-card">
-                    <h3>💪 Physical Wellness</h3>
-                    <p>The body keeps the score - let's listen to what it's saying</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                physical_col1, physical_col2 = st.columns(2)
-                
-                with physical_col1:
-                    exercise_today = st.radio(
-                        "Movement today:",
-                        ["Yes", "A little", "No"],
-                        help="Any movement counts!"
-                    )
-                    
-                    movement_type = []
-                    if exercise_today != "No":
-                        movement_type = st.multiselect(
-                            "Types of movement:",
-                            [
-                                "Walking", "Yoga", "Stretching", "Dancing",
-                                "Running", "Strength training", "Sports",
-                                "Cleaning/housework", "Playing with pets"
-                            ]
-                        )
-                    
-                    sleep_quality = st.slider(
-                        "Sleep quality (1-10):",
-                        min_value=1, max_value=10, value=5, step=1
-                    )
-                    
-                    # Bowel movement tracking (important for all conditions)
-                    bowel_frequency = st.selectbox(
-                        "Bowel movements today:",
-                        ["0", "1", "2", "3", "4+"],
-                        help="Digestive health reflects overall wellness and affects mood/energy"
-                    )
-                    
-                    bowel_quality = st.selectbox(
-                        "Stool consistency (Bristol Scale):",
-                        [
-                            "Select...",
-                            "Type 1: Hard lumps (severe constipation)",
-                            "Type 2: Lumpy sausage (mild constipation)", 
-                            "Type 3: Sausage with cracks (normal-dry)",
-                            "Type 4: Smooth sausage (ideal)",
-                            "Type 5: Soft blobs (lacking fibre)",
-                            "Type 6: Mushy (mild diarrhoea)",
-                            "Type 7: Liquid (diarrhoea)"
-                        ],
-                        help="Bristol Stool Chart is used medically to assess digestive health"
-                    )
-                
-                with physical_col2:
-                    # Digestive sounds (often overlooked but important)
-                    digestive_sounds = st.selectbox(
-                        "Digestive sounds/rumbling today:",
-                        [
-                            "Select...",
-                            "Normal occasional rumbles when hungry",
-                            "Very quiet/no sounds noticed", 
-                            "Frequent loud rumbling throughout day",
-                            "Excessive gurgling after meals",
-                            "Rumbling increases when anxious/stressed",
-                            "Embarrassingly loud in quiet situations",
-                            "Didn't pay attention to this"
-                        ],
-                        help="Gut sounds reflect digestion, stress levels, and nervous system activity"
-                    )
-                    
-                    physical_symptoms = st.multiselect(
-                        "Physical symptoms noticed:",
-                        [
-                            "Headaches", "Muscle tension", "Fatigue",
-                            "Digestive issues", "Heart racing", 
-                            "Shortness of breath", "None today"
-                        ]
-                    )
-                    
-                    body_tension = st.multiselect(
-                        "Where did you feel tension:",
-                        [
-                            "Neck", "Shoulders", "Jaw", "Back",
-                            "Stomach", "Chest", "Everywhere", "None"
-                        ]
-                    )
-            
-            # Emotional & Trauma Responses (Show for depression, trauma, anxiety, or low mood)
-            show_emotional = (
-                mood_rating <= 4 or
-                "depression" in tracking_reason.lower() or
-                "trauma" in tracking_reason.lower() or
-                "anxiety" in tracking_reason.lower()
+
+            period_status = st.selectbox(
+                "Period status today:",
+                PERIOD_STATUS_OPTIONS,
+                help="Track flow intensity and cycle phase"
             )
-            
-            # Always show as expandable section, auto-expand if conditions met
-            with st.expander("💙 Emotional & Trauma Responses", expanded=show_emotional):
-                st.markdown("""
-                <div class="section-card">
-                    <h3>💙 Emotional & Trauma Responses</h3>
-                    <p>Your emotions are information, not problems to fix</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                emotional_col1, emotional_col2 = st.columns(2)
-                
-                with emotional_col1:
-                    stress_level = st.slider(
-                        "Stress level:",
-                        min_value=1, max_value=10, value=5, step=1
-                    )
-                    
-                    patience_level = st.slider(
-                        "How patient were you today (with yourself and others)?",
-                        min_value=1, max_value=10, value=5, step=1,
-                        help="1 = Very impatient/irritable, 10 = Very patient and understanding"
-                    )
-                    
-                    trauma_responses = st.multiselect(
-                        "Trauma responses noticed:",
-                        [
-                            "Flashbacks/intrusive thoughts", "Hypervigilance",
-                            "Dissociation", "Emotional numbness", 
-                            "Intense anger", "Panic/anxiety", "PTSD symptoms", "None today"
-                        ]
-                    )
-                
-                with emotional_col2:
-                    triggers_today = st.radio(
-                        "Emotional triggers encountered:",
-                        ["Yes", "Maybe", "No"]
-                    )
-                    
-                    trigger_impact = 0
-                    if triggers_today == "Yes":
-                        trigger_impact = st.slider(
-                            "How much did triggers affect you:",
-                            min_value=1, max_value=10, value=5, step=1
-                        )
-                    
-                    coping_strategies = st.multiselect(
-                        "Healthy coping used:",
-                        [
-                            "Talked to someone", "Deep breathing",
-                            "Journaling", "Creative expression",
-                            "Time in nature", "Meditation", "None"
-                        ]
-                    )
-            
-            # Connection & Support (expand if isolated or for depression/trauma)
-            show_connection = (
-                "isolated" in social_connection.lower() or
-                "depression" in tracking_reason.lower() or
-                "trauma" in tracking_reason.lower()
+
+            # Hormonal symptoms
+            hormonal_symptoms = st.multiselect(
+                "Hormonal symptoms today:",
+                HORMONAL_SYMPTOMS,
+                help="Symptoms that may relate to your menstrual cycle"
             )
-            
-            # Always show as expandable section, auto-expand if conditions met
-            with st.expander("🤗 Connection & Support", expanded=show_connection):
-                st.markdown("""
-                <div class="section-card">
-                    <h3>🤗 Connection & Support</h3>
-                    <p>Healing happens in relationship - every connection matters</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                support_col1, support_col2 = st.columns(2)
-                
-                with support_col1:
-                    felt_supported = st.radio(
-                        "Felt supported today:",
-                        [
-                            "Yes, deeply supported",
-                            "Somewhat supported",
-                            "A little supported", 
-                            "Not really supported",
-                            "Completely alone"
-                        ]
-                    )
-                    
-                    safe_people_time = st.number_input(
-                        "Time with safe people (hours):",
-                        min_value=0.0, max_value=24.0, value=0.0, step=0.25,
-                        help="Includes family, friends, therapists, support groups, pets"
-                    )
-                
-                with support_col2:
-                    support_types = st.multiselect(
-                        "Support received:",
-                        [
-                            "Emotional support", "Physical comfort",
-                            "Practical help", "Professional support",
-                            "Pet companionship", "Online community",
-                            "None today"
-                        ]
-                    )
-                    
-                    relationship_conflicts = st.selectbox(
-                        "Relationship conflicts:",
-                        [
-                            "Select...",
-                            "None - peaceful day",
-                            "Minor disagreement",
-                            "Moderate conflict",
-                            "Major argument",
-                            "Felt unsafe with someone"
-                        ]
-                    )
-            
-            # Menstrual & Hormonal Health (conditional based on gender, tracking reason, or user choice)
-            show_menstrual = (
-                "hormonal" in tracking_reason.lower() or
-                gender in ["Female", "Transgender female", "Non-binary"]
+
+        with menstrual_col2:
+            # Birth control tracking
+            on_birth_control = st.radio(
+                "Are you on hormonal birth control?",
+                BIRTH_CONTROL_OPTIONS,
+                help="Helps understand if symptoms are natural cycle or medication-related",
+                key="on_birth_control"
             )
-            
-            # Always show as expandable section, auto-expand if conditions met
-            with st.expander("🌸 Menstrual Cycle Tracking", expanded=show_menstrual):
-                st.markdown("""
-                <div class="section-card">
-                    <h3>🌸 Menstrual & Hormonal Health</h3>
-                    <p>Hormones affect everything: mood, energy, pain, digestion, sleep, and mental clarity</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                menstrual_col1, menstrual_col2 = st.columns(2)
-                
-                with menstrual_col1:
-                    # Basic cycle tracking
-                    cycle_day = st.number_input(
-                        "What day of your cycle? (Day 1 = first day of period):",
-                        min_value=1, max_value=50, value=1, step=1,
-                        help="Day 1 = first day of menstrual bleeding. Average cycle is 28 days."
-                    )
-                    
-                    period_status = st.selectbox(
-                        "Period status today:",
-                        [
-                            "Select...",
-                            "Heavy flow (changing pad/tampon every 1-2 hours)",
-                            "Medium flow (changing every 3-4 hours)", 
-                            "Light flow (changing every 4-6 hours)",
-                            "Spotting (very light bleeding)",
-                            "No bleeding today",
-                            "PMS symptoms (before period)",
-                            "Ovulation signs (mid-cycle)",
-                            "Post-period recovery"
-                        ],
-                        help="Track flow intensity and cycle phase"
-                    )
-                    
-                    # Hormonal symptoms
-                    hormonal_symptoms = st.multiselect(
-                        "Hormonal symptoms today:",
-                        [
-                            "Breast tenderness", "Bloating/water retention", 
-                            "Menstrual cramps", "Lower back pain",
-                            "Mood swings", "Food cravings", "Acne breakouts",
-                            "Headaches/migraines", "Fatigue", "Irritability",
-                            "Hot flushes", "Night sweats", "None today"
-                        ],
-                        help="Symptoms that may relate to your menstrual cycle"
-                    )
-                
-                with menstrual_col2:
-                    # Birth control tracking
-                    on_birth_control = st.radio(
-                        "Are you on hormonal birth control?",
-                        ["Yes", "No", "Prefer not to say"],
-                        help="Helps understand if symptoms are natural cycle or medication-related"
-                    )
-                    
-                    pill_day = 0
-                    started_new_pack = False
-                    missed_pills = "No missed pills"
-                    
-                    if on_birth_control == "Yes":
-                        pill_day = st.number_input(
-                            "What day of your birth control pack?",
-                            min_value=1, max_value=28, value=1, step=1,
-                            help="Day 1 = first active pill of new pack"
-                        )
-                        
-                        started_new_pack = st.checkbox(
-                            "Started new pack today?",
-                            help="Track when you begin a new contraceptive pill pack"
-                        )
-                        
-                        missed_pills = st.selectbox(
-                            "Missed any pills recently?",
-                            [
-                                "No missed pills",
-                                "Missed 1 pill this week",
-                                "Missed 2-3 pills this week", 
-                                "Missed more than 3 pills",
-                                "Irregular pill timing"
-                            ],
-                            help="Missed pills can affect mood, cycle, and effectiveness"
-                        )
-                    
-                    # Cycle phase estimation (helpful for pattern recognition)
-                    # Auto-calculate based on cycle day
-                    def get_cycle_phase(cycle_day):
-                        if 1 <= cycle_day <= 5:
-                            return "Menstrual phase (Days 1-5)"
-                        elif 6 <= cycle_day <= 13:
-                            return "Follicular phase (Days 6-13)"
-                        elif 14 <= cycle_day <= 16:
-                            return "Ovulatory phase (Days 14-16)"
-                        elif 17 <= cycle_day <= 28:
-                            return "Luteal phase (Days 17-28)"
-                        else:
-                            return "Extended cycle/Irregular"
-                    
-                    # Get the calculated phase as default
-                    calculated_phase = get_cycle_phase(cycle_day)
-                    
-                    phase_options = [
-                        "Menstrual phase (Days 1-5)",
-                        "Follicular phase (Days 6-13)", 
-                        "Ovulatory phase (Days 14-16)",
-                        "Luteal phase (Days 17-28)",
-                        "Extended cycle/Irregular",
-                        "Post-menopausal",
-                        "Perimenopausal"
-                    ]
-                    
-                    # Find index of calculated phase, default to 0 if not found
-                    try:
-                        default_index = phase_options.index(calculated_phase)
-                    except ValueError:
-                        default_index = 4  # Extended cycle/Irregular
-                    
-                    estimated_phase = st.selectbox(
-                        "Estimated cycle phase:",
-                        phase_options,
-                        index=default_index,
-                        help="Auto-calculated based on cycle day - you can adjust if needed"
-                    )
-                    
-                    # Period pain level
-                    period_pain = st.slider(
-                        "Period-related pain level today:",
-                        min_value=0, max_value=10, value=0, step=1,
-                        help="0 = No pain, 10 = Severe pain requiring medical attention"
-                    )
 
-        # ===============================
-        # OPTIONAL GROWTH SECTIONS
-        # ===============================
-
-        with st.expander("🌱 Optional: Growth & Meaning (when you have extra energy)"):
-            st.markdown("""
-            <div class="optional-section">
-                <h4>🧘‍♀️ Mindfulness & Growth</h4>
-                <p>These are bonus questions for when you're feeling strong</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            growth_col1, growth_col2 = st.columns(2)
-            
-            with growth_col1:
-                mindfulness_minutes = st.number_input(
-                    "Mindfulness/meditation (minutes):",
-                    min_value=0, max_value=120, value=0, step=1
-                )
-                
-                gratitude = st.text_area(
-                    "What are you grateful for today:",
-                    placeholder="Small moments count: a cuppa, a kind text, sunshine...",
-                    height=80
-                )
-            
-            with growth_col2:
-                self_compassion = st.slider(
-                    "How kind to yourself (1-10):",
-                    min_value=1, max_value=10, value=5, step=1
-                )
-                
-                hope_level = st.slider(
-                    "Hope for the future:",
-                    min_value=1, max_value=10, value=5, step=1
-                )
+            pill_day = 0
+            started_new_pack = False
+            missed_pills = "No missed pills"
 
-        # ===============================
-        # TRADITIONAL CHINESE MEDICINE INDICATORS
-        # ===============================
-
-        with st.expander("🉐 Traditional Chinese Medicine Insights (optional but valuable)"):
-            st.markdown("""
-            <div class="optional-section">
-                <h4>🌸 TCM Daily Assessment</h4>
-                <p>Traditional Chinese Medicine looks at subtle patterns that reveal deeper health insights</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            tcm_col1, tcm_col2 = st.columns(2)
-            
-            with tcm_col1:
-                # Tongue observation (mirror of internal health)
-                tongue_colour = st.selectbox(
-                    "Tongue colour this morning:",
-                    [
-                        "Select...",
-                        "Healthy pink",
-                        "Pale (possible Qi/blood deficiency)",
-                        "Red (heat/inflammation in body)",
-                        "Purple (blood/Qi stagnation, cold)",
-                        "Dark red (excess heat)"
-                    ],
-                    help="Check tongue in morning before eating/drinking - reflects internal organ health"
+            if st.session_state.on_birth_control == "Yes":
+                pill_day = st.number_input(
+                    "What day of your birth control pack?",
+                    min_value=1, max_value=28, step=1,
+                    help="Day 1 = first active pill of new pack",
+                    key="pill_day"
                 )
-                
-                tongue_coating = st.selectbox(
-                    "Tongue coating:",
-                    [
-                        "Select...",
-                        "Thin white (healthy)",
-                        "Thick white (dampness/cold)",
-                        "Yellow coating (heat/inflammation)",
-                        "No coating (Yin deficiency)",
-                        "Greasy/thick (excess dampness)"
-                    ],
-                    help="Coating reflects digestive health and internal dampness/heat"
-                )
-                
-                tongue_shape = st.multiselect(
-                    "Tongue characteristics:",
-                    [
-                        "Normal size/shape",
-                        "Swollen/puffy (Qi deficiency)",
-                        "Teeth marks on sides (Spleen weakness)",
-                        "Cracks/fissures (Yin deficiency)",
-                        "Thin/narrow (blood deficiency)",
-                        "Pointed/tense sides (stress/Liver Qi stagnation)"
-                    ],
-                    help="Shape reveals constitutional patterns and organ function"
-                )
-            
-            with tcm_col2:
-                # Energy and constitutional patterns
-                qi_energy = st.slider(
-                    "Qi (life energy) level:",
-                    min_value=1, max_value=10, value=5, step=1,
-                    help="1 = Completely depleted, 10 = Vibrant life force energy"
-                )
-                
-                body_temperature = st.selectbox(
-                    "Body temperature tendency today:",
-                    [
-                        "Select...",
-                        "Balanced/normal",
-                        "Running cold (Yang deficiency)",
-                        "Running hot (Yin deficiency/heat)",
-                        "Cold hands/feet, warm body",
-                        "Hot flashes/cold spells"
-                    ],
-                    help="Temperature patterns reveal Yang (warming) vs Yin (cooling) balance"
-                )
-                
-                dampness_signs = st.multiselect(
-                    "Signs of dampness (poor fluid metabolism):",
-                    [
-                        "Feeling heavy/sluggish",
-                        "Bloating after meals",
-                        "Sticky/sweet taste in mouth",
-                        "Excessive mucus/phlegm",
-                        "Foggy thinking",
-                        "Swollen ankles/puffiness",
-                        "Loose stools",
-                        "None noticed"
-                    ],
-                    help="Dampness = sluggish metabolism of fluids, common in modern lifestyle"
+
+                started_new_pack = st.checkbox(
+                    "Started new pack today?",
+                    help="Track when you begin a new contraceptive pill pack",
+                    key="started_new_pack"
                 )
-                
-                emotional_element = st.selectbox(
-                    "Dominant emotion/element today:",
-                    [
-                        "Select...",
-                        "Balanced/centred",
-                        "Worry/overthinking (Earth/Spleen)",
-                        "Anger/frustration (Wood/Liver)",
-                        "Joy/overexcitement (Fire/Heart)",
-                        "Sadness/grief (Metal/Lung)",
-                        "Fear/anxiety (Water/Kidney)"
-                    ],
-                    help="Five Element theory: emotions reflect organ energy imbalances"
+
+                missed_pills = st.selectbox(
+                    "Missed any pills recently?",
+                    MISSED_PILLS_OPTIONS,
+                    help="Missed pills can affect mood, cycle, and effectiveness",
+                    key="missed_pills"
                 )
 
+            # Cycle phase estimation (helpful for pattern recognition)
+            # Auto-calculate based on cycle day and use it as the default
+            calculated_phase = get_cycle_phase(cycle_day)
+
+            estimated_phase = st.selectbox(
+                "Estimated cycle phase:",
+                list(CyclePhase),
+                index=calculated_phase,
+                format_func=PHASE_LABELS.get,
+                help="Auto-calculated based on cycle day - you can adjust if needed"
+            )
+
+            # Period pain level
+            period_pain = st.slider(
+                "Period-related pain level today:",
+                min_value=0, max_value=10, value=0, step=1,
+                help="0 = No pain, 10 = Severe pain requiring medical attention"
+            )
+
+    st.session_state.checkin['menstrual'] = {
+        'cycle_day': cycle_day,
+        'period_status': period_status,
+        'hormonal_symptoms': frozenset(hormonal_symptoms),
+        'on_birth_control': on_birth_control,
+        'pill_day': pill_day,
+        'started_new_pack': started_new_pack,
+        'missed_pills': missed_pills,
+        'estimated_phase': PHASE_LABELS[estimated_phase],  # saved as the label
+        'period_pain': period_pain
+    }
+
+@st.fragment
+def _render_daily_checkin():
+    """Draw the daily check-in and save it when the button is pressed"""
+    # Starting values for the follow-up questions, set once per session so
+    # the widgets keep whatever the user picked between reruns
+    for key, value in FOLLOW_UP_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    # Latest answers from each section, filled in by the section fragments
+    st.session_state.setdefault('checkin', {})
+
+    # The optional extras are only built when switched on
+    optional_col1, optional_col2, optional_col3 = st.columns(3, gap="small")
+    with optional_col1:
+        st.toggle("🌱 Add growth & meaning questions", key="include_growth")
+    with optional_col2:
+        st.toggle("🉐 Add TCM insights", key="include_tcm")
+    with optional_col3:
+        st.toggle("🌸 Add cycle tracking", key="include_menstrual",
+                  help="Shown automatically for hormonal tracking or when your gender suggests it")
+
+    # Main tracking reason - personalises the entire experience
+    tracking_reason = st.selectbox(
+        "🎯 What's your main reason for tracking wellness?",
+        TRACKING_REASONS,
+        help="This helps personalise your tracking experience"
+    )
+
+    # Optional demographic info for relevant sections
+    with st.expander("👤 Optional: Demographics (helps personalise your experience)"):
+        gender = st.selectbox(
+            "Gender (optional - helps show relevant health sections):",
+            GENDER_OPTIONS,
+            help="Used only to show relevant health tracking sections (like menstrual cycle)"
+        )
+
+    # Date - Australian format DD/MM/YYYY
+    selected_date = st.date_input(
+        "📅 Today's date:",
+        datetime.date.today(),
+        format="DD/MM/YYYY",
+        help="Australian date format: day/month/year"
+    )
+
+    # Progress tracking motivation with personalised messaging
+    if tracking_reason != "Select your primary focus...":
+        _, reason_title, reason_lower = reason_parts(tracking_reason)  # emoji removed
+        st.markdown(_habit_streak_html(reason_title, reason_lower, get_streak_day(conn)), unsafe_allow_html=True)
+    else:
+        st.markdown(HABIT_STREAK_HTML, unsafe_allow_html=True)
+
+    # Progress tracking
+    quick_mode = st.checkbox("⚡ Quick Mode (5 minutes)", value=False, help="Just the essentials when you're short on time")
+
+    if quick_mode:
+        st.info("👍 Perfect! Consistency matters more than completeness. Let's do the essentials!")
+    else:
+        st.success("🌟 Full check-in mode - you're investing in your healing today!")
+
+    # ===============================
+    # CORE ESSENTIALS (Always visible)
+    # ===============================
+
+    _render_essentials()
+    essentials = st.session_state.checkin['essentials']
+
+    # ===============================
+    # CONDITIONAL SECTIONS (Based on mode/responses)
+    # ===============================
+
+    # The core sections are always shown as expandable sections, and
+    # auto-expand when their conditions are met
+    if not quick_mode:
+        show = _visibility_flags(
+            tracking_reason,
+            essentials['mood_rating'],
+            essentials['safety_level'],
+            essentials['energy_level'],
+            essentials['social_connection'],
+            gender
+        )
+        _render_safety_section(show['safety'])
+        _render_physical_section(show['physical'])
+        _render_emotional_section(show['emotional'])
+        _render_connection_section(show['connection'])
+
+        # Cycle tracking is only built when it's relevant or switched on
+        include_menstrual = show['menstrual'] or st.session_state.include_menstrual
+        if include_menstrual:
+            _render_menstrual_section(True)
+
+    # ===============================
+    # OPTIONAL GROWTH SECTIONS
+    # ===============================
+
+    # Only built when switched on at the top of the check-in
+    # (its code is only imported the first time it's switched on)
+    if st.session_state.include_growth:
+        from sections.growth import render as render_growth
+        render_growth()
+
+    # ===============================
+    # TRADITIONAL CHINESE MEDICINE INDICATORS
+    # ===============================
+
+    # Only built when switched on at the top of the check-in
+    # (its code and option lists are only imported the first time it's switched on)
+    if st.session_state.include_tcm:
+        from sections.tcm import render as render_tcm
+        render_tcm()
+
+    # ===============================
+    # SAVE BUTTON & DATA PROCESSING
+    # ===============================
+
+    # The notes box sits in a small form with the save button, so typing a
+    # long note doesn't rerun anything until the entry is saved
+    with st.form("save_checkin", border=False):
         # Additional notes
         notes = st.text_area(
             "📝 Additional notes (optional):",
@@ -1024,144 +1500,140 @@ with tab1:
 
         st.markdown("---")
 
-        # ===============================
-        # SUBMIT BUTTON & DATA PROCESSING
-        # ===============================
-
         submitted = st.form_submit_button(
             "💾 Save Today's Data",
             type="primary",
             use_container_width=True
         )
-        
-        if submitted:
-            # Create comprehensive data entry
-            entry = {
-                'date': selected_date,
-                'tracking_reason': tracking_reason,
-                'mood_rating': mood_rating,
-                'safety_level': safety_level,
-                'energy_level': energy_level,
-                'sleep_hours': sleep_hours,
-                'water_intake': water_intake,
-                'social_connection': social_connection,
-                'daily_win': daily_win,
-                'quick_mode': quick_mode,
-                'notes': notes
+
+    if submitted:
+        checkin = st.session_state.checkin
+
+        # Create comprehensive data entry
+        entry = {
+            'date': selected_date,
+            'tracking_reason': tracking_reason,
+            **essentials,
+            'quick_mode': quick_mode,
+            'notes': notes
+        }
+
+        # Add conditional fields based on what was shown
+        if not quick_mode:
+            if show['safety']:
+                entry.update(checkin['safety'])
+
+            if show['physical']:
+                entry.update(checkin['physical'])
+
+            if show['emotional']:
+                entry.update(checkin['emotional'])
+
+            if show['connection']:
+                entry.update(checkin['connection'])
+
+            if include_menstrual:
+                entry.update(checkin['menstrual'])
+
+            # Growth & meaning
+            if st.session_state.include_growth:
+                entry.update(checkin['growth'])
+
+            # TCM
+            if st.session_state.include_tcm:
+                entry.update(checkin['tcm'])
+
+        try:
+            # Save to database
+            entry_id = save_to_database(db, entry)
+        except Exception as e:
+            st.error(f"❌ Error saving to database: {str(e)}")
+        else:
+            # Remember what was saved, then rerun the whole app (not just
+            # this fragment) so the calendar, analytics and sidebar include it
+            st.session_state.last_saved_entry = {
+                'id': entry_id,
+                'summary': {
+                    'Date': selected_date.strftime('%d/%m/%Y'),
+                    'Mood': f"{essentials['mood_rating']}/10",
+                    'Safety': f"{essentials['safety_level']}/10",
+                    'Energy': f"{essentials['energy_level']}/10",
+                    'Sleep': f"{essentials['sleep_hours']}h",
+                    'Water': f"{essentials['water_intake']}L",
+                    'Daily Win': essentials['daily_win'] or "None recorded"
+                }
             }
-            
-            # Add conditional fields based on what was shown
-            if not quick_mode:
-                if 'show_safety' in locals() and show_safety:
-                    entry.update({
-                        'body_awareness': body_awareness,
-                        'hypervigilance': hypervigilance,
-                        'grounding_techniques': grounding_techniques,
-                        'present_moment': present_moment
-                    })
-                
-                if 'show_physical' in locals() and show_physical:
-                    entry.update({
-                        'exercise_today': exercise_today,
-                        'movement_type': movement_type,
-                        'sleep_quality': sleep_quality,
-                        'bowel_frequency': bowel_frequency,
-                        'bowel_quality': bowel_quality,
-                        'digestive_sounds': digestive_sounds,
-                        'physical_symptoms': physical_symptoms,
-                        'body_tension': body_tension
-                    })
-                
-                if 'show_emotional' in locals() and show_emotional:
-                    entry.update({
-                        'stress_level': stress_level,
-                        'patience_level': patience_level,
-                        'trauma_responses': trauma_responses,
-                        'triggers_today': triggers_today,
-                        'trigger_impact': trigger_impact,
-                        'coping_strategies': coping_strategies
-                    })
-                
-                if 'show_connection' in locals() and show_connection:
-                    entry.update({
-                        'felt_supported': felt_supported,
-                        'safe_people_time': safe_people_time,
-                        'support_types': support_types,
-                        'relationship_conflicts': relationship_conflicts
-                    })
-                
-                if 'show_menstrual' in locals() and show_menstrual:
-                    entry.update({
-                        'cycle_day': cycle_day,
-                        'period_status': period_status,
-                        'hormonal_symptoms': hormonal_symptoms,
-                        'on_birth_control': on_birth_control,
-                        'pill_day': pill_day,
-                        'started_new_pack': started_new_pack,
-                        'missed_pills': missed_pills,
-                        'estimated_phase': estimated_phase,
-                        'period_pain': period_pain
-                    })
-                
-                # Growth & meaning
-                entry.update({
-                    'mindfulness_minutes': mindfulness_minutes,
-                    'gratitude': gratitude,
-                    'self_compassion': self_compassion,
-                    'hope_level': hope_level
-                })
-                
-                # TCM
-                entry.update({
-                    'tongue_colour': tongue_colour,
-                    'tongue_coating': tongue_coating,
-                    'tongue_shape': tongue_shape,
-                    'qi_energy': qi_energy,
-                    'body_temperature': body_temperature,
-                    'dampness_signs': dampness_signs,
-                    'emotional_element': emotional_element
-                })
-            
+            st.rerun()
+
+    # Confirmation for the entry saved just before the rerun
+    saved_entry = st.session_state.pop('last_saved_entry', None)
+    if saved_entry:
+        st.success(f"✅ Entry #{saved_entry['id']} saved successfully for {saved_entry['summary']['Date']}!")
+        st.balloons()
+
+        # Show summary
+        with st.expander("📋 View saved data summary"):
+            for key, value in saved_entry['summary'].items():
+                st.write(f"**{key}:** {value}")
+
+with tab1:
+    st.markdown(CHECKIN_HEADER_HTML, unsafe_allow_html=True)
+    _render_daily_checkin()
+    
+    # Backfilling lots of past days? Import them all at once instead of
+    # saving the check-in once per day (e.g. an earlier export or another device)
+    with st.expander("📤 Backfill past entries from a CSV file"):
+        uploaded_csv = st.file_uploader(
+            "Upload a wellness CSV file:",
+            type="csv",
+            help="Days that already have an entry are kept and skipped in the import"
+        )
+        
+        if uploaded_csv is not None and st.button("📤 Import Entries"):
             try:
-                # Save to database
-                entry_id = save_to_database(conn, entry)
-                
-                st.success(f"✅ Entry #{entry_id} saved successfully for {selected_date.strftime('%d/%m/%Y')}!")
-                st.balloons()
-                
-                # Show summary
-                with st.expander("📋 View saved data summary"):
-                    summary_data = {
-                        'Date': selected_date.strftime('%d/%m/%Y'),
-                        'Mood': f"{mood_rating}/10",
-                        'Safety': f"{safety_level}/10",
-                        'Energy': f"{energy_level}/10",
-                        'Sleep': f"{sleep_hours}h",
-                        'Water': f"{water_intake}L",
-                        'Daily Win': daily_win or "None recorded"
-                    }
-                    
-                    for key, value in summary_data.items():
-                        st.write(f"**{key}:** {value}")
-                        
-            except Exception as e:
-                st.error(f"❌ Error saving to database: {str(e)}")
+                backfill_entries = read_entries_csv(uploaded_csv)
+            except (ValueError, json.JSONDecodeError) as e:
+                # A cell (or the whole file) that can't be read - the message says which row and column
+                st.error(f"Couldn't read this CSV file, so nothing was imported. {e}")
+            else:
+                try:
+                    # One transaction for the whole file (see bulk_import)
+                    imported_count = bulk_import(db, backfill_entries)
+                    st.success(f"✅ Imported {imported_count} entries!")
+                except Exception as e:
+                    st.error(f"Error importing entries: {str(e)}")
 
 # ===============================
 # TAB 2: CALENDAR VIEW
 # ===============================
 
-with tab2:
+# Calendar day colours, picked by wellness band: red (below 5), yellow (5 to
+# under 7), green (7+), and grey for days with no entry
+CALENDAR_COLOURS = np.array([
+    "rgba(244, 67, 54, 0.8)",   # Red
+    "rgba(255, 193, 7, 0.8)",   # Yellow
+    "rgba(76, 175, 80, 0.8)",   # Green
+    "rgba(200, 200, 200, 0.3)"  # No data
+])
+NO_DATA_BAND = 3
+
+# The calendar runs as a fragment, so changing the month or year only
+# redraws the calendar
+@st.fragment
+def _render_calendar():
+    """Draw the Calendar tab for the selected month"""
     st.markdown("## 🗓️ Calendar View")
     
     try:
-        df = load_from_database(conn)
+        # Only the years are needed up front - the month itself is loaded below
+        available_years = load_year_range(conn)
         
-        if df.empty:
+        if not available_years:
             st.info("📅 No data yet! Complete your first daily check-in to see your calendar.")
         else:
-            # Convert date column
-            df['date'] = pd.to_datetime(df['date'])
+            # Chart libraries are only imported once there's something to draw
+            import calendar                     # Calendar operations
+            import plotly.graph_objects as go   # Advanced charts
             
             # Calendar controls
             calendar_col1, calendar_col2 = st.columns(2)
@@ -1176,18 +1648,11 @@ with tab2:
                 )
                 
             with calendar_col2:
-                available_years = sorted(df['date'].dt.year.unique())
-                if available_years:
-                    default_year_idx = available_years.index(current_date.year) if current_date.year in available_years else 0
-                    selected_year = st.selectbox("Select Year:", available_years, index=default_year_idx)
-                else:
-                    selected_year = current_date.year
+                default_year_idx = available_years.index(current_date.year) if current_date.year in available_years else 0
+                selected_year = st.selectbox("Select Year:", available_years, index=default_year_idx)
             
-            # Filter data for selected month/year
-            month_data = df[
-                (df['date'].dt.month == selected_month) & 
-                (df['date'].dt.year == selected_year)
-            ]
+            # Ask SQLite for just the selected month/year
+            month_data = load_month(conn, selected_year, selected_month)
             
             if month_data.empty:
                 st.warning(f"No data for {calendar.month_name[selected_month]} {selected_year}")
@@ -1202,6 +1667,17 @@ with tab2:
                 
                 days_of_week = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
                 
+                # Every day goes into ONE scatter trace - a trace per day meant
+                # up to 31 separate objects for Plotly to build and send
+                xs, ys, day_labels, averages, hover_texts = [], [], [], [], []
+                
+                # Look up each day's ratings by day of the month, built once
+                # (newest entry wins if an older database has two for one day)
+                first_per_day = month_data.drop_duplicates('date')
+                by_day = first_per_day.set_index('day_of_month')[
+                    ['mood_rating', 'energy_level', 'safety_level']
+                ].to_dict('index')
+                
                 for week_num, week in enumerate(cal):
                     for day_num, day in enumerate(week):
                         if day == 0:  # Empty cell in calendar
@@ -1209,45 +1685,48 @@ with tab2:
                         
                         # Find data for this day
                         day_date = datetime.date(selected_year, selected_month, day)
-                        day_data = month_data[month_data['date'].dt.date == day_date]
+                        day_record = by_day.get(day)
                         
-                        if not day_data.empty:
-                            mood_value = day_data['mood_rating'].iloc[0]
-                            energy_value = day_data['energy_level'].iloc[0]
-                            safety_value = day_data['safety_level'].iloc[0]
+                        if day_record is not None:
+                            mood_value = day_record['mood_rating']
+                            energy_value = day_record['energy_level']
+                            safety_value = day_record['safety_level']
                             
                             # Create average for colour
-                            avg_wellness = (mood_value + energy_value + safety_value) / 3
-                            
-                            # Colour based on wellness (green = good, red = poor)
-                            if avg_wellness >= 7:
-                                colour = "rgba(76, 175, 80, 0.8)"  # Green
-                            elif avg_wellness >= 5:
-                                colour = "rgba(255, 193, 7, 0.8)"  # Yellow
-                            else:
-                                colour = "rgba(244, 67, 54, 0.8)"  # Red
-                            
-                            hover_text = f"Date: {day_date.strftime('%d/%m/%Y')}<br>Mood: {mood_value}/10<br>Energy: {energy_value}/10<br>Safety: {safety_value}/10"
+                            averages.append((mood_value + energy_value + safety_value) / 3)
+                            hover_texts.append(f"Date: {day_date.strftime('%d/%m/%Y')}<br>Mood: {mood_value}/10<br>Energy: {energy_value}/10<br>Safety: {safety_value}/10")
                         else:
-                            avg_wellness = 0
-                            colour = "rgba(200, 200, 200, 0.3)"
-                            hover_text = f"Date: {day_date.strftime('%d/%m/%Y')}<br>No data"
+                            averages.append(np.nan)
+                            hover_texts.append(f"Date: {day_date.strftime('%d/%m/%Y')}<br>No data")
                         
-                        calendar_fig.add_trace(go.Scatter(
-                            x=[day_num],
-                            y=[6-week_num],  # Flip Y axis
-                            mode='markers+text',
-                            marker=dict(
-                                size=50,
-                                color=colour,
-                                line=dict(width=2, color='white')
-                            ),
-                            text=str(day),
-                            textposition="middle center",
-                            textfont=dict(size=14, color='white', family="Arial Black"),
-                            hovertemplate=hover_text + "<extra></extra>",
-                            showlegend=False
-                        ))
+                        xs.append(day_num)
+                        ys.append(6 - week_num)  # Flip Y axis
+                        day_labels.append(str(day))
+                
+                # Colour based on wellness (green = good, red = poor, grey = no data),
+                # worked out for the whole month at once
+                averages = np.array(averages, dtype=float)
+                bands = np.digitize(averages, [5, 7])
+                bands[np.isnan(averages)] = NO_DATA_BAND
+                colours = CALENDAR_COLOURS[bands]
+                
+                calendar_fig.add_trace(go.Scatter(
+                    # Small whole numbers, so Plotly sends "3" rather than "3.0"
+                    x=np.asarray(xs, dtype=np.int8),
+                    y=np.asarray(ys, dtype=np.int8),
+                    mode='markers+text',
+                    marker=dict(
+                        size=50,
+                        color=colours,
+                        line=dict(width=2, color='white')
+                    ),
+                    text=day_labels,
+                    textposition="middle center",
+                    textfont=dict(size=14, color='white', family="Arial Black"),
+                    hovertext=hover_texts,
+                    hovertemplate="%{hovertext}<extra></extra>",
+                    showlegend=False
+                ))
                 
                 # Update calendar layout
                 calendar_fig.update_layout(
@@ -1270,46 +1749,58 @@ with tab2:
                 st.markdown("### 📈 Monthly Summary")
                 summary_col1, summary_col2, summary_col3, summary_col4 = st.columns(4)
                 
+                # Averages straight from the NumPy arrays (nanmean skips blanks like pandas does)
+                month_mood, month_energy, month_sleep = (
+                    np.nanmean(month_data[column].to_numpy())
+                    for column in ('mood_rating', 'energy_level', 'sleep_hours')
+                )
+                
                 with summary_col1:
-                    avg_mood = month_data['mood_rating'].mean()
-                    st.metric("Average Mood", f"{avg_mood:.1f}/10")
+                    st.metric("Average Mood", f"{month_mood:.1f}/10")
                 
                 with summary_col2:
-                    avg_energy = month_data['energy_level'].mean()
-                    st.metric("Average Energy", f"{avg_energy:.1f}/10")
+                    st.metric("Average Energy", f"{month_energy:.1f}/10")
                 
                 with summary_col3:
                     total_entries = len(month_data)
                     st.metric("Days Tracked", total_entries)
                 
                 with summary_col4:
-                    avg_sleep = month_data['sleep_hours'].mean()
-                    st.metric("Average Sleep", f"{avg_sleep:.1f}h")
+                    st.metric("Average Sleep", f"{month_sleep:.1f}h")
                 
                 # Daily breakdown
                 st.markdown("### 📊 Daily Breakdown")
-                display_data = month_data[['date', 'mood_rating', 'energy_level', 'safety_level', 'sleep_hours', 'daily_win']].copy()
-                display_data['date'] = display_data['date'].dt.strftime('%d/%m/%Y')
+                display_data = month_data[['date_display', 'mood_rating', 'energy_level', 'safety_level', 'sleep_hours', 'daily_win']].copy()
                 display_data.columns = ['Date', 'Mood', 'Energy', 'Safety', 'Sleep (h)', 'Daily Win']
                 st.dataframe(display_data, use_container_width=True, hide_index=True)
                 
     except Exception as e:
         st.error(f"Error loading calendar data: {str(e)}")
 
+with tab2:
+    _render_calendar()
+
 # ===============================
 # TAB 3: ANALYTICS
 # ===============================
 
-with tab3:
+# Analytics runs as a fragment too, so picking an analysis or export range
+# only redraws this tab
+@st.fragment
+def _render_analytics():
+    """Draw the Analytics tab (charts, insights and exports)"""
     st.markdown("## 📊 Analytics & Insights")
     
     try:
-        df = load_from_database(conn)
+        df = load_analytics_view(conn)
+        analytics_version = _table_version(conn)  # cache key for the charts below
         
         if df.empty:
             st.info("📊 No data to analyse yet! Complete a few daily check-ins to see insights.")
         else:
-            df['date'] = pd.to_datetime(df['date'])
+            # Chart libraries are only imported once there's something to draw
+            import plotly.express as px         # Interactive charts
+            import plotly.graph_objects as go   # Advanced charts
             
             # Analytics selection
             analytics_option = st.selectbox(
@@ -1323,49 +1814,53 @@ with tab3:
                 
                 metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
                 
+                # Averages straight from the NumPy arrays, and the rows are
+                # newest first so the latest date is simply the first one
+                avg_mood = np.nanmean(df['mood_rating'].to_numpy())
+                avg_sleep = np.nanmean(df['sleep_hours'].to_numpy())
+                latest_date = df['date'].iat[0].date()
+                
                 with metrics_col1:
                     total_entries = len(df)
                     st.metric("Total Entries", total_entries)
                 
                 with metrics_col2:
-                    avg_mood = df['mood_rating'].mean()
                     st.metric("Average Mood", f"{avg_mood:.1f}/10")
                 
                 with metrics_col3:
-                    streak_days = (datetime.date.today() - df['date'].max().date()).days
+                    streak_days = (datetime.date.today() - latest_date).days
                     st.metric("Days Since Last Entry", streak_days)
                 
                 with metrics_col4:
-                    avg_sleep = df['sleep_hours'].mean()
                     st.metric("Average Sleep", f"{avg_sleep:.1f}h")
                 
                 # Recent trends
                 if len(df) >= 7:
                     st.markdown("### 📊 Recent Trends (Last 7 Entries)")
                     
-                    recent_data = df.head(7).sort_values('date')
+                    recent_data = load_recent(conn, 7)
                     
                     trend_fig = go.Figure()
                     
                     trend_fig.add_trace(go.Scatter(
-                        x=recent_data['date'],
-                        y=recent_data['mood_rating'],
+                        x=recent_data['date'].to_numpy(),
+                        y=recent_data['mood_rating'].to_numpy(),
                         mode='lines+markers',
                         name='Mood',
                         line=dict(color='blue', width=3)
                     ))
                     
                     trend_fig.add_trace(go.Scatter(
-                        x=recent_data['date'],
-                        y=recent_data['energy_level'],
+                        x=recent_data['date'].to_numpy(),
+                        y=recent_data['energy_level'].to_numpy(),
                         mode='lines+markers',
                         name='Energy',
                         line=dict(color='green', width=3)
                     ))
                     
                     trend_fig.add_trace(go.Scatter(
-                        x=recent_data['date'],
-                        y=recent_data['safety_level'],
+                        x=recent_data['date'].to_numpy(),
+                        y=recent_data['safety_level'].to_numpy(),
                         mode='lines+markers',
                         name='Safety',
                         line=dict(color='orange', width=3)
@@ -1405,13 +1900,14 @@ with tab3:
             
             elif analytics_option == "Sleep Analysis":
                 # Sleep vs mood correlation
-                sleep_mood_fig = px.scatter(
-                    df, 
-                    x='sleep_hours', 
-                    y='mood_rating',
-                    title='Sleep Hours vs Mood Rating',
-                    trendline='ols',
-                    labels={'sleep_hours': 'Sleep Hours', 'mood_rating': 'Mood Rating'}
+                sleep_mood_fig = _trendline_figure(
+                    analytics_version,
+                    'sleep_hours',
+                    'mood_rating',
+                    'Sleep Hours vs Mood Rating',
+                    {'sleep_hours': 'Sleep Hours', 'mood_rating': 'Mood Rating'},
+                    'ols',
+                    df
                 )
                 st.plotly_chart(sleep_mood_fig, use_container_width=True)
                 
@@ -1447,7 +1943,7 @@ with tab3:
                         y=df['energy_level'],
                         mode='markers',
                         name='Water Intake vs Energy',
-                        text=df['date'].dt.strftime('%d/%m/%Y'),
+                        text=df['date_display'],
                         hovertemplate='Water: %{x}L<br>Energy: %{y}/10<br>Date: %{text}<extra></extra>'
                     ))
                     
@@ -1474,7 +1970,7 @@ with tab3:
                 available_cols = [col for col in numeric_cols if col in df.columns and df[col].notna().any()]
                 
                 if len(available_cols) >= 2:
-                    corr_data = df[available_cols].corr()
+                    corr_data, strongest_pair = _correlation_summary(analytics_version, tuple(available_cols), df)
                     
                     corr_fig = px.imshow(
                         corr_data,
@@ -1487,22 +1983,21 @@ with tab3:
                     # Correlation insights
                     st.markdown("### 🔍 Correlation Insights")
                     
-                    strongest_corr = corr_data.abs().unstack().sort_values(ascending=False)
-                    # Remove self-correlations
-                    strongest_corr = strongest_corr[strongest_corr < 1.0]
-                    
-                    if len(strongest_corr) > 0:
-                        top_corr = strongest_corr.iloc[0]
-                        corr_pair = strongest_corr.index[0]
+                    if strongest_pair is not None:
+                        corr_pair, top_corr = strongest_pair
                         
                         st.info(f"💡 **Strongest correlation:** {corr_pair[0]} and {corr_pair[1]} (r = {top_corr:.3f})")
                 else:
                     st.warning("Need at least 2 numeric columns for correlation analysis")
             
             elif analytics_option == "Menstrual Cycle Insights":
-                # Check if menstrual data exists
-                cycle_cols = ['cycle_day', 'period_status', 'hormonal_symptoms']
-                has_cycle_data = any(col in df.columns and df[col].notna().any() for col in cycle_cols)
+                # Check if menstrual data exists (symptoms are counted by SQLite,
+                # so the JSON symptom lists never need to be loaded here)
+                cycle_cols = ['cycle_day', 'period_status']
+                has_cycle_data = (
+                    any(col in df.columns and df[col].notna().any() for col in cycle_cols) or
+                    ('hormonal_symptom_count' in df.columns and (df['hormonal_symptom_count'] > 0).any())
+                )
                 
                 if has_cycle_data:
                     st.markdown("### 🌸 Cycle-Related Patterns")
@@ -1512,24 +2007,26 @@ with tab3:
                         
                         if len(cycle_data) > 5:
                             # Mood across cycle
-                            cycle_mood_fig = px.scatter(
-                                cycle_data,
-                                x='cycle_day',
-                                y='mood_rating',
-                                title='Mood Across Menstrual Cycle',
-                                labels={'cycle_day': 'Cycle Day', 'mood_rating': 'Mood Rating'},
-                                trendline='lowess'
+                            cycle_mood_fig = _trendline_figure(
+                                analytics_version,
+                                'cycle_day',
+                                'mood_rating',
+                                'Mood Across Menstrual Cycle',
+                                {'cycle_day': 'Cycle Day', 'mood_rating': 'Mood Rating'},
+                                'lowess',
+                                cycle_data
                             )
                             st.plotly_chart(cycle_mood_fig, use_container_width=True)
                             
                             # Energy across cycle
-                            cycle_energy_fig = px.scatter(
-                                cycle_data,
-                                x='cycle_day',
-                                y='energy_level',
-                                title='Energy Across Menstrual Cycle',
-                                labels={'cycle_day': 'Cycle Day', 'energy_level': 'Energy Level'},
-                                trendline='lowess'
+                            cycle_energy_fig = _trendline_figure(
+                                analytics_version,
+                                'cycle_day',
+                                'energy_level',
+                                'Energy Across Menstrual Cycle',
+                                {'cycle_day': 'Cycle Day', 'energy_level': 'Energy Level'},
+                                'lowess',
+                                cycle_data
                             )
                             st.plotly_chart(cycle_energy_fig, use_container_width=True)
                             
@@ -1556,10 +2053,10 @@ with tab3:
             
             with export_col1:
                 if st.button("📥 Download Full Database as CSV"):
-                    csv = df.to_csv(index=False)
+                    # Export needs every column, so read the full table only when asked
                     st.download_button(
                         label="Download Full Database",
-                        data=csv,
+                        data=export_csv(conn),
                         file_name=f"wellness_database_{datetime.date.today().strftime('%d-%m-%Y')}.csv",
                         mime="text/csv"
                     )
@@ -1580,16 +2077,11 @@ with tab3:
                     )
                     
                     if len(date_range) == 2 and date_range[0] <= date_range[1]:
-                        filtered_df = df[
-                            (df['date'].dt.date >= date_range[0]) & 
-                            (df['date'].dt.date <= date_range[1])
-                        ]
-                        
                         if st.button("📅 Download Date Range"):
-                            csv = filtered_df.to_csv(index=False)
+                            # SQLite picks out the date range
                             st.download_button(
                                 label="Download Filtered Data",
-                                data=csv,
+                                data=export_csv(conn, date_range),
                                 file_name=f"wellness_data_{date_range[0].strftime('%d-%m-%Y')}_to_{date_range[1].strftime('%d-%m-%Y')}.csv",
                                 mime="text/csv"
                             )
@@ -1597,121 +2089,100 @@ with tab3:
     except Exception as e:
         st.error(f"Error in analytics: {str(e)}")
 
+with tab3:
+    _render_analytics()
+
 # ===============================
 # SIDEBAR WITH QUICK STATS
 # ===============================
 
-with st.sidebar:
+# The three averages share one small table (one element instead of three metrics)
+AVERAGES_TABLE_TEMPLATE = """
+| 😊 Avg Mood | ⚡ Avg Energy | 🛡️ Avg Safety |
+|---|---|---|
+| {mood} | {energy} | {safety} |
+"""
+
+# How to show the mood trend, indexed by trend + 1 (worse, stable, improving)
+TREND_MESSAGES = (
+    (st.warning, "📉 Recent trend: Consider extra self-care"),
+    (st.info, "➡️ Recent trend: Stable"),
+    (st.success, "📈 Recent trend: Improving!"),
+)
+
+def _rating_text(average):
+    """An average out of 10 for the sidebar (entries added outside the app may leave it blank)"""
+    return "—" if average is None else f"{average:.1f}/10"
+
+# The sidebar is a fragment as well, so widgets elsewhere in the app
+# don't re-read its stats
+@st.fragment
+def _render_sidebar():
+    """Quick stats, quick actions and crisis support in the sidebar"""
     st.markdown("## 🎯 Quick Stats")
     
+    # Only the database read is guarded - the quick actions and crisis
+    # support below should always show, even if the stats can't be loaded
     try:
-        df = load_from_database(conn)
-        
-        if not df.empty:
-            total_entries = len(df)
+        stats = get_sidebar_stats(conn)
+    except sqlite3.Error as e:
+        st.error(f"Sidebar error: {str(e)}")
+    else:
+        # No entries yet comes back as None, so this one check covers it
+        if stats is not None:
+            st.metric("📊 Total Entries", stats['total_entries'])
+            st.metric("📅 Days Since Last Entry", f"{stats['days_since_last']} days")
+            st.markdown(AVERAGES_TABLE_TEMPLATE.format(
+                mood=_rating_text(stats['avg_mood']),
+                energy=_rating_text(stats['avg_energy']),
+                safety=_rating_text(stats['avg_safety'])
+            ))
             
-            if total_entries > 0:
-                # Convert date column for calculations
-                df['date'] = pd.to_datetime(df['date'])
-                
-                # Current streak calculation (simplified)
-                latest_date = df['date'].max().date()
-                days_since_last = (datetime.date.today() - latest_date).days
-                
-                # Average metrics
-                avg_mood = df['mood_rating'].mean()
-                avg_energy = df['energy_level'].mean()
-                avg_safety = df['safety_level'].mean()
-                
-                st.metric("📊 Total Entries", total_entries)
-                st.metric("📅 Days Since Last Entry", f"{days_since_last} days")
-                st.metric("😊 Average Mood", f"{avg_mood:.1f}/10")
-                st.metric("⚡ Average Energy", f"{avg_energy:.1f}/10")
-                st.metric("🛡️ Average Safety", f"{avg_safety:.1f}/10")
-                
-                # Quick insights
-                st.markdown("---")
-                st.markdown("### 💡 Quick Insights")
-                
-                # Best and worst days
-                best_day = df.loc[df['mood_rating'].idxmax()]
-                worst_day = df.loc[df['mood_rating'].idxmin()]
-                
-                best_date = pd.to_datetime(best_day['date']).strftime('%d/%m/%Y')
-                worst_date = pd.to_datetime(worst_day['date']).strftime('%d/%m/%Y')
-                
-                st.success(f"🌟 **Best mood day:** {best_date} ({best_day['mood_rating']}/10)")
-                if best_day['daily_win']:
-                    st.caption(f"Win: {best_day['daily_win']}")
-                
-                st.info(f"💙 **Challenging day:** {worst_date} ({worst_day['mood_rating']}/10)")
+            # Quick insights
+            st.markdown("---")
+            st.markdown("### 💡 Quick Insights")
+            
+            # Best and worst days (only entries with a mood rating count)
+            if stats['best_mood'] is not None:
+                st.success(f"🌟 **Best mood day:** {stats['best_date']} ({stats['best_mood']}/10)")
+                if stats['best_win']:
+                    st.caption(f"Win: {stats['best_win']}")
                 
-                # Trend indicator
-                if len(df) >= 7:
-                    recent_avg = df.head(3)['mood_rating'].mean()
-                    older_avg = df.tail(3)['mood_rating'].mean()
-                    
-                    if recent_avg > older_avg:
-                        st.success("📈 Recent trend: Improving!")
-                    elif recent_avg < older_avg:
-                        st.warning("📉 Recent trend: Consider extra self-care")
-                    else:
-                        st.info("➡️ Recent trend: Stable")
+                st.info(f"💙 **Challenging day:** {stats['worst_date']} ({stats['worst_mood']}/10)")
+            
+            # Trend indicator
+            if stats['trend'] is not None:
+                show_trend, trend_message = TREND_MESSAGES[stats['trend'] + 1]
+                show_trend(trend_message)
             
         else:
             st.info("No data yet - complete your first entry!")
             
-        # Database file info
-        if os.path.exists("wellness_tracker.db"):
-            file_size = os.path.getsize("wellness_tracker.db")
-            st.metric("💾 Database Size", f"{file_size / 1024:.1f} KB")
-            
-        # Quick actions
-        st.markdown("---")
-        st.markdown("### 🚀 Quick Actions")
-        
-        if st.button("🔄 Refresh Data"):
-            st.rerun()
+    # Database file info
+    file_size_kb = database_size_kb()
+    if file_size_kb is not None:
+        st.metric("💾 Database Size", f"{file_size_kb:.1f} KB")
         
-        # Australian crisis resources
-        with st.expander("🆘 Crisis Support (Australia)"):
-            st.markdown("""
-            **If you're in crisis, please reach out:**
-            
-            🔴 **Emergency:** 000
-            
-            📞 **Mental Health Crisis:**
-            - Lifeline: 13 11 14
-            - Suicide Call Back Service: 1300 659 467
-            - Kids Helpline: 1800 55 1800
-            
-            💬 **24/7 Text Support:**
-            - Crisis Text Line: Text HELLO to 741741
-            
-            🌐 **Online Support:**
-            - Beyond Blue: beyondblue.org.au
-            - Headspace: headspace.org.au
-            - SANE Australia: sane.org
-            
-            **You matter. Your life has value. ❤️**
-            """)
-            
-    except Exception as e:
-        st.error(f"Sidebar error: {str(e)}")
+    # Quick actions
+    st.markdown("---")
+    st.markdown("### 🚀 Quick Actions")
+    
+    if st.button("🔄 Refresh Data"):
+        st.rerun()
+    
+    # Australian crisis resources
+    with st.expander("🆘 Crisis Support (Australia)"):
+        st.markdown(CRISIS_SUPPORT_MD)
+
+with st.sidebar:
+    _render_sidebar()
 
 # ===============================
 # FOOTER
 # ===============================
 
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666; padding: 1rem;'>
-    💙 <strong>Your Wellness Tracker</strong> • 
-    Built with care for your healing journey • 
-    Last updated: {current_time} • 
-    🇦🇺 Made in Australia
-</div>
-""".format(current_time=datetime.datetime.now().strftime('%d/%m/%Y %H:%M')), unsafe_allow_html=True)
+st.markdown(_footer_html(), unsafe_allow_html=True)
 
 # ===============================
 # AUSTRALIAN ENGLISH IMPROVEMENTS